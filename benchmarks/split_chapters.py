@@ -0,0 +1,98 @@
+"""
+Benchmark chapter splitting on a generated long source: the old output-side seek (`-i src -ss ...`, one ffmpeg per
+chapter), input-side seek (`-ss ... -i src`, one ffmpeg per chapter), and the single-pass `ffmpeg_split` that
+`do_chapters` uses. Also reports how far each strategy's cuts stray from the requested chapter lengths.
+
+    uv run python benchmarks/split_chapters.py --hours 3 --chapters 60
+
+Needs ffmpeg. No network.
+"""
+
+import argparse
+import subprocess
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from youtube_music_dl.downloader import Chapter, ffmpeg_extract_segment, ffmpeg_split
+from youtube_music_dl.tagging import audio_length_s
+
+
+def make_source(path: Path, seconds: float) -> None:
+    subprocess.run(
+        [
+            "ffmpeg",
+            "-y",
+            "-hide_banner",
+            "-loglevel",
+            "error",
+            "-f",
+            "lavfi",
+            "-i",
+            "sine=frequency=440",
+            "-t",
+            str(seconds),
+            "-ac",
+            "1",
+            "-c:a",
+            "libopus",
+            "-b:a",
+            "32k",
+            str(path),
+        ],
+        check=True,
+    )
+
+
+def output_side_segment(source: Path, start: float, end: float, dest: Path) -> None:
+    """How chapters were cut before input-side seeking: ffmpeg reads everything up to `start` and throws it away."""
+    subprocess.run(
+        ["ffmpeg", "-y", "-hide_banner", "-loglevel", "error", "-i", str(source)]
+        + ["-ss", str(start), "-to", str(end), "-c", "copy", str(dest)],
+        check=True,
+    )
+
+
+def run(name: str, split: Callable[[list[Path]], None], chapters: list[Chapter], out_dir: Path) -> None:
+    dests = [out_dir / f"{name}-{i:03d}.opus" for i in range(len(chapters))]
+    started = time.perf_counter()
+    split(dests)
+    elapsed = time.perf_counter() - started
+    errors = [abs((audio_length_s(d) or 0.0) - (c.end - c.start)) for c, d in zip(chapters, dests)]
+    print(f"{name:<12} {elapsed:8.2f}s   max length error {max(errors) * 1000:6.1f}ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hours", type=float, default=2.0, help="length of the generated source")
+    parser.add_argument("--chapters", type=int, default=40, help="number of equal-length chapters to cut")
+    args = parser.parse_args()
+
+    seconds = args.hours * 3600
+    step = seconds / args.chapters
+    chapters = [Chapter(str(i), i * step, (i + 1) * step) for i in range(args.chapters)]
+    with tempfile.TemporaryDirectory(prefix="ymd-bench-") as tmp:
+        out_dir = Path(tmp)
+        source = out_dir / "source.opus"
+        print(f"generating a {args.hours:g}h source...")
+        make_source(source, seconds)
+        print(f"cutting {args.chapters} chapters:")
+
+        def per_chapter(cut: Callable[[Path, float, float, Path], None]) -> Callable[[list[Path]], None]:
+            def split(dests: list[Path]) -> None:
+                for chapter, dest in zip(chapters, dests):
+                    cut(source, chapter.start, chapter.end, dest)
+
+            return split
+
+        def single_pass(dests: list[Path]) -> None:
+            ffmpeg_split(source, [(c.start, c.end, dest) for c, dest in zip(chapters, dests)])
+
+        run("output-seek", per_chapter(output_side_segment), chapters, out_dir)
+        run("input-seek", per_chapter(ffmpeg_extract_segment), chapters, out_dir)
+        run("single-pass", single_pass, chapters, out_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Benchmark CLI startup: for each command that never downloads (`--version`, `--print-schema`, `--print-skill`, `retag`,
+`upgrade`), how long Python spends importing, per `python -X importtime`, and which of the heavy dependencies (yt-dlp,
+jsonschema, mutagen) it loaded. The offline tests check that `import youtube_music_dl.command_line` loads none of them,
+and costs less than importing yt-dlp alone; this shows where each command's time goes, in absolute numbers.
+
+    uv run python benchmarks/startup.py --runs 5
+
+No network.
+"""
+
+import argparse
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+
+HEAVY = ("yt_dlp", "jsonschema", "mutagen")
+IMPORT_LINE = re.compile(r"^import time:\s+\d+ \|\s+(\d+) \|( *)(\S+)$")
+
+
+def imports(argv: list[str]) -> dict[str, int]:
+    """The top-level modules `argv` (a python command line, after the interpreter) imported: cumulative us each."""
+    proc = subprocess.run([sys.executable, "-X", "importtime", *argv], capture_output=True, text=True)
+    modules = {}
+    for line in proc.stderr.splitlines():
+        if (match := IMPORT_LINE.match(line)) and len(match[2]) == 1:
+            modules[match[3]] = int(match[1])
+    return modules
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="runs per command; the median is reported")
+    args = parser.parse_args()
+
+    cli = ["-m", "youtube_music_dl.command_line"]
+    with tempfile.TemporaryDirectory(prefix="ymd-bench-") as empty_album:
+        commands = {
+            "import": ["-c", "import youtube_music_dl.command_line"],
+            "--version": [*cli, "--version"],
+            "--print-schema": [*cli, "--print-schema"],
+            "--print-skill": [*cli, "--print-skill"],
+            "retag": [*cli, "retag", empty_album, "--artist", "A"],
+            "upgrade --help": [*cli, "upgrade", "--help"],
+        }
+        for name, argv in commands.items():
+            runs = [imports(argv) for _ in range(args.runs)]
+            total_ms = statistics.median(sum(run.values()) for run in runs) / 1000
+            heavy = [module for module in HEAVY if module in runs[0]] or ["none"]
+            print(f"{name:<16} {total_ms:7.1f}ms importing   heavy: {', '.join(heavy)}")
+
+
+if __name__ == "__main__":
+    main()
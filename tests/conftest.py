@@ -28,6 +28,22 @@ def load_youtube_fixtures() -> dict[str, str]:
     return {k: v for k, v in data.items() if isinstance(v, str) and v and not k.startswith("_")}
 
 
+@pytest.fixture(autouse=True)
+def isolated_cache(monkeypatch, tmp_path_factory):
+    """Point the on-disk probe cache at a fresh directory, so tests never read (or litter) the user's real one."""
+    import youtube_music_dl.downloader as dl
+    from youtube_music_dl.cache import ProbeCache
+
+    monkeypatch.setenv("YMD_CACHE_DIR", str(tmp_path_factory.mktemp("cache")))
+    monkeypatch.setattr(dl, "PROBE_CACHE", ProbeCache.from_env())  # the process's one was built at import
+
+
+@pytest.fixture(autouse=True)
+def full_validation(monkeypatch):
+    """Have the CLI check all of its output against the schemas, whatever YMD_VALIDATE the environment sets."""
+    monkeypatch.delenv("YMD_VALIDATE", raising=False)
+
+
 @pytest.fixture
 def make_audio(tmp_path: Path):
     """Generate a single-tone audio file (opus, m4a, or mp3) of a given duration."""
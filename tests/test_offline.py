@@ -4,9 +4,11 @@ access.
 """
 
 import json
+import re
 import subprocess
 import sys
 from pathlib import Path
+from typing import Any
 
 import jsonschema
 import pytest
@@ -14,6 +16,7 @@ import pytest
 from tests.conftest import requires_ffmpeg
 from youtube_music_dl import schema
 from youtube_music_dl.downloader import (
+    TitleCleaner,
     UserError,
     clean_filename,
     detect_mode,
@@ -27,6 +30,7 @@ from youtube_music_dl.downloader import (
     retag,
     strip,
 )
+from youtube_music_dl.ratelimit import CircuitBreaker, RateLimiter, is_throttling
 from youtube_music_dl.tagging import existing_files_by_id, read_provenance, tag_audio
 
 # --- pure helpers ---------------------------------------------------------
@@ -80,6 +84,8 @@ def test_strip_collapses_and_trims_whitespace():
 )
 def test_get_strip_meta_patterns(raw: str, artist: str, album: str, expected: str):
     assert (strip(raw, get_strip_meta_patterns(artist, album)) or raw) == expected
+    clean_title = TitleCleaner(get_strip_meta_patterns(artist, album))
+    assert clean_title(raw) == clean_title(raw) == expected  # the second time from its cache
 
 
 def test_clean_filename():
@@ -165,6 +171,8 @@ def test_tag_roundtrip(make_audio, fmt):
         album="Os Afro-Sambas",
         tracknumber="1/3",
         youtube_video_id="abc123XYZ_-",
+        date="1966-05-01",
+        comment="https://www.youtube.com/watch?v=abc123XYZ_-",
     )
     assert read_provenance(path) == "abc123XYZ_-"
 
@@ -176,6 +184,8 @@ def test_tag_roundtrip(make_audio, fmt):
     assert audio["artist"] == ["Baden Powell"]
     assert audio["album"] == ["Os Afro-Sambas"]
     assert audio["tracknumber"] == ["1/3"]
+    assert audio["date"] == ["1966-05-01"]
+    assert audio["comment"] == ["https://www.youtube.com/watch?v=abc123XYZ_-"]
 
 
 @requires_ffmpeg
@@ -189,6 +199,58 @@ def test_existing_files_by_id(make_audio, tmp_path: Path):
     assert by_id["VID_A"][0].name == a.name
 
 
+def test_existing_files_by_id_only_parses_new_or_changed_files(monkeypatch, tmp_path: Path):
+    import os
+
+    from youtube_music_dl import tagging
+
+    parsed: list[str] = []
+
+    def fake_read_provenance(path: Path) -> str | None:
+        parsed.append(path.name)
+        return f"VID_{path.stem}"
+
+    monkeypatch.setattr(tagging, "read_provenance", fake_read_provenance)
+    for name in ("a.opus", "b.mp3", "notes.txt"):
+        (tmp_path / name).write_bytes(b"x")
+
+    assert existing_files_by_id(tmp_path) == {"VID_a": [tmp_path / "a.opus"], "VID_b": [tmp_path / "b.mp3"]}
+    assert sorted(parsed) == ["a.opus", "b.mp3"]
+    assert (tmp_path / tagging.INDEX_NAME).exists()
+
+    parsed.clear()
+    existing_files_by_id(tmp_path)
+    assert parsed == []  # unchanged stats: trusted from the index
+
+    (tmp_path / "b.mp3").write_bytes(b"retagged elsewhere")
+    os.utime(tmp_path / "b.mp3", ns=(1, 1))
+    (tmp_path / "a.opus").unlink()
+    (tmp_path / "c.m4a").write_bytes(b"x")
+    assert set(existing_files_by_id(tmp_path)) == {"VID_b", "VID_c"}
+    assert sorted(parsed) == ["b.mp3", "c.m4a"]  # only the changed and the new file are reopened
+    assert set(tagging.load_index(tmp_path)) == {"b.mp3", "c.m4a"}  # the deleted file's row is dropped
+
+
+def test_corrupt_provenance_index_is_rebuilt(monkeypatch, tmp_path: Path):
+    from youtube_music_dl import tagging
+
+    monkeypatch.setattr(tagging, "read_provenance", lambda path: "VID")
+    (tmp_path / "a.opus").write_bytes(b"x")
+    (tmp_path / tagging.INDEX_NAME).write_text("{not json")
+    assert existing_files_by_id(tmp_path) == {"VID": [tmp_path / "a.opus"]}
+    assert tagging.load_index(tmp_path)["a.opus"]["youtube_video_id"] == "VID"
+
+    # one bad row is just that file's to parse again, not the whole album's check failing
+    (tmp_path / "b.opus").write_bytes(b"x")
+    (tmp_path / "c.opus").write_bytes(b"x")
+    rows: dict[str, Any] = tagging.load_index(tmp_path)
+    rows["b.opus"] = ["not", "a", "row"]
+    rows["c.opus"] = {k: v for k, v in tagging.index_row(tmp_path / "c.opus", "OLD").items() if k != "youtube_video_id"}
+    (tmp_path / tagging.INDEX_NAME).write_text(json.dumps({"version": tagging.INDEX_VERSION, "files": rows}))
+    assert existing_files_by_id(tmp_path) == {"VID": [tmp_path / f"{name}.opus" for name in "abc"]}
+    assert all(row["youtube_video_id"] == "VID" for row in tagging.load_index(tmp_path).values())
+
+
 # --- local chapter split (the core offline end-to-end) --------------------
 
 
@@ -227,6 +289,76 @@ def test_split_by_chapters_offline(make_audio, tmp_path: Path):
     assert set(existing_files_by_id(out_dir)) == {"SRC_ID"}
 
 
+@requires_ffmpeg
+def test_split_chapters_one_pass_reports_failures_per_chapter(make_audio, tmp_path: Path):
+    from youtube_music_dl.downloader import Chapter, split_chapters
+
+    source = make_audio("source", seconds=6.0, fmt="opus")
+    dests = [tmp_path / f"{i:02d}.opus" for i in range(1, 4)]
+
+    assert split_chapters(source, [Chapter("A", 0, 2), Chapter("B", 2, 4), Chapter("C", 4, 6)], dests) == [None] * 3
+    for dest in dests:
+        assert 1.8 < media_duration_s(dest) < 2.3
+
+    # impossible bounds fail up front, without ffmpeg; the others are still cut
+    errors = split_chapters(source, [Chapter("A", 0, 2), Chapter("B", 4, 2), Chapter("C", 4, 6)], dests)
+    assert errors[0] is None and errors[2] is None
+    assert isinstance(errors[1], ValueError)
+
+    # a chapter ffmpeg can't write fails the single pass; the fallback pins the failure on that chapter alone
+    unwritable = [dests[0], tmp_path / "missing" / "02.opus", dests[2]]
+    errors = split_chapters(source, [Chapter("A", 0, 2), Chapter("B", 2, 4), Chapter("C", 4, 6)], unwritable)
+    assert errors[0] is None and errors[2] is None
+    assert isinstance(errors[1], subprocess.CalledProcessError)
+
+
+def test_seek_input_seeks_before_the_input():
+    from youtube_music_dl.downloader import seek_input
+
+    args = seek_input(Path("src.opus"), 12.5, 20.0)
+    assert args.index("-ss") < args.index("-i")  # input-side: seek, don't read from the top of the file
+    assert args[args.index("-t") + 1] == "7.5"
+    with pytest.raises(ValueError):
+        seek_input(Path("src.opus"), 20.0, 12.5)  # ffmpeg would happily produce an empty file for this
+
+
+@requires_ffmpeg
+@pytest.mark.parametrize("fmt", ["opus", "m4a", "mp3"])
+def test_input_side_seek_keeps_chapter_boundaries(make_audio, tmp_path: Path, capfd, fmt):
+    from youtube_music_dl.downloader import SEEK_TOLERANCE_S, Chapter, warn_if_inaccurate
+    from youtube_music_dl.tagging import audio_length_s
+
+    source = make_audio("source", seconds=30.0, fmt=fmt)
+    chapter = Chapter("B", 11.3, 23.9)
+    dest = tmp_path / f"cut.{fmt}"
+    ffmpeg_extract_segment(source, chapter.start, chapter.end, dest)
+    length = audio_length_s(dest)
+    assert length is not None and abs(length - (chapter.end - chapter.start)) <= SEEK_TOLERANCE_S
+    warn_if_inaccurate(dest, chapter, 2)
+    assert "chapter 2" not in capfd.readouterr().err
+
+
+def test_resolve_duration_prefers_in_process_sources(monkeypatch, tmp_path: Path):
+    import youtube_music_dl.downloader as dl
+
+    probed: list[Path] = []
+
+    def fake_ffprobe(path: Path) -> float:
+        probed.append(path)
+        return 99.0
+
+    monkeypatch.setattr(dl, "media_duration_s", fake_ffprobe)
+    lengths = {"agree": 180.4, "disagree": 95.0, "unreadable": None, "unreported": 61.2}
+    monkeypatch.setattr(dl, "audio_length_s", lambda path: lengths[path.stem])
+
+    assert dl.resolve_duration_s(tmp_path / "agree.opus", 180) == 180.4  # mutagen's precise length wins
+    assert dl.resolve_duration_s(tmp_path / "unreported.opus", None) == 61.2  # the file alone is enough
+    assert probed == []
+    assert dl.resolve_duration_s(tmp_path / "disagree.opus", 180) == 99.0  # a truncated file? ask ffprobe
+    assert dl.resolve_duration_s(tmp_path / "unreadable.opus", 180) == 99.0
+    assert len(probed) == 2
+
+
 # --- downloader precondition errors (raised before any network) -----------
 
 
@@ -275,6 +407,7 @@ def test_result_schema_accepts_sample():
                 "error": {"message": "ERROR: [youtube] def: Private video.", "permanent": True},
             },
         ],
+        "throttle_pause_s": 0,
     }
     schema.validate_result(sample)
 
@@ -290,11 +423,35 @@ def test_result_schema_rejects_bad_status():
         "format": "opus",
         "chapters_file": None,
         "tracks": [{"index": 1, "status": "bogus", "title": "t", "youtube_video_id": None, "url": None, "file": None}],
+        "throttle_pause_s": 0,
     }
     with pytest.raises(jsonschema.ValidationError):
         schema.validate_result(bad)
 
 
+def test_check_output_follows_ymd_validate(monkeypatch):
+    bad = {"version": schema.SCHEMA_VERSION, "ok": False, "error": {"code": "NOT_A_CODE", "message": "x"}}
+    with pytest.raises(jsonschema.ValidationError):
+        schema.check_output(bad, schema.ERROR_SCHEMA)  # full by default
+    validator = schema._validators["ERROR_SCHEMA"]
+    schema.validate(schema.make_error("NO_INFO", "x"), schema.ERROR_SCHEMA)
+    assert schema._validators["ERROR_SCHEMA"] is validator  # compiled once, then reused
+    cached = dict(schema._validators)
+    schema.validate("x", {"type": "string"})
+    with pytest.raises(jsonschema.ValidationError):
+        schema.validate("x", {"type": "integer"})  # a temporary schema is never mistaken for an earlier one
+    assert schema._validators == cached  # nor kept
+
+    monkeypatch.setenv("YMD_VALIDATE", "off")
+    schema.check_output(bad, schema.ERROR_SCHEMA)
+    monkeypatch.setenv("YMD_VALIDATE", "sample")
+    monkeypatch.setattr(schema.random, "random", lambda: 0.5)
+    schema.check_output(bad, schema.ERROR_SCHEMA)  # not in the sample
+    monkeypatch.setattr(schema.random, "random", lambda: 0.0)
+    with pytest.raises(jsonschema.ValidationError):
+        schema.check_output(bad, schema.ERROR_SCHEMA)
+
+
 def test_error_schema_roundtrip():
     err = schema.make_error("NO_JS_RUNTIME", "install deno or node")
     schema.validate_error(err)
@@ -364,6 +521,7 @@ def test_with_retries_recovers_from_a_transient_failure(monkeypatch, capfd):
 
     slept_s: list[float] = []
     monkeypatch.setattr(dl.time, "sleep", slept_s.append)
+    monkeypatch.setattr(dl, "jitter", lambda delay_s: delay_s)
     outcomes = [dl.Outcome(None, THROTTLED_ERROR), dl.Outcome("ok")]  # throttled once, then succeeds
 
     assert dl.with_retries(lambda: outcomes.pop(0), "downloading X").value == "ok"
@@ -376,6 +534,7 @@ def test_with_retries_gives_up_after_the_configured_delays(monkeypatch):
 
     slept_s: list[float] = []
     monkeypatch.setattr(dl.time, "sleep", slept_s.append)
+    monkeypatch.setattr(dl, "jitter", lambda delay_s: delay_s)
     calls: list[int] = []
 
     def attempt() -> dl.Outcome[str]:
@@ -446,6 +605,775 @@ def test_extraction_failed_message_only_blames_ytdlp_when_it_might_be_at_fault()
     assert "not a bot" in transient and "upgrade" in transient  # reason kept, hint still offered
 
 
+# --- parallel playlist downloads (no network) ------------------------------
+
+
+def _fake_ctx(tmp_path: Path, **overrides):
+    import youtube_music_dl.downloader as dl
+
+    base = dl.Ctx(
+        directory=tmp_path,
+        ext=".opus",
+        audio_format="opus",
+        audio_quality="",
+        artist="Artist",
+        album="Album",
+        clean_title=dl.TitleCleaner(),
+        existing={},
+    )
+    return base._replace(**overrides)
+
+
+def test_do_playlist_parallel_matches_serial(monkeypatch, tmp_path: Path):
+    import random
+    import time
+
+    import youtube_music_dl.downloader as dl
+
+    def fake_fetch_track(pending, ctx):
+        time.sleep(random.uniform(0, 0.02))  # finish out of order
+        if pending.index == 3:
+            return dl.Track(pending.index, "failed", "", None, pending.url, None, dl.track_error(THROTTLED_ERROR))
+        return dl.Downloaded(pending.url, pending.index, {"id": pending.url[-3:]}, tmp_path / "x.opus")
+
+    def fake_finish_track(downloaded, total, ctx):
+        time.sleep(random.uniform(0, 0.01))
+        index = downloaded.index
+        return dl.Track(index, "downloaded", f"T{index}", downloaded.info["id"], downloaded.url, f"/{index:02d}.opus")
+
+    monkeypatch.setattr(dl, "fetch_track", fake_fetch_track)
+    monkeypatch.setattr(dl, "finish_track", fake_finish_track)
+    monkeypatch.setattr(dl, "DEFERRED_RETRY_DELAYS_S", (0.0, 0.0))
+    entries: list[dict[str, str] | None] = [{"id": f"v{i:02d}", "title": f"T{i}"} for i in range(1, 13)]
+    entries[4] = None  # an unlistable entry keeps its slot
+    top = {"entries": entries}
+    existing = {"v07": [tmp_path / "07 - T7.opus"]}
+
+    serial = dl.do_playlist(top, _fake_ctx(tmp_path, existing=existing), "")
+    parallel = dl.do_playlist(top, _fake_ctx(tmp_path, existing=existing, jobs=6), "")
+    assert [t.index for t in parallel] == list(range(1, 13))
+    assert json.dumps([dl.track_json(t) for t in parallel]) == json.dumps([dl.track_json(t) for t in serial])
+    assert parallel[6].status == "skipped" and parallel[4].status == "failed"
+
+
+def test_download_slots_raises_a_finishing_error_without_deadlocking(monkeypatch, tmp_path: Path):
+    import youtube_music_dl.downloader as dl
+
+    def fake_fetch_track(pending, ctx):
+        return dl.Downloaded(pending.url, pending.index, {"id": "x"}, tmp_path / "x.opus")
+
+    def broken_finish_track(downloaded, total, ctx):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(dl, "fetch_track", fake_fetch_track)
+    monkeypatch.setattr(dl, "finish_track", broken_finish_track)
+    slots: list = [dl.Pending(f"https://y/{i}", i) for i in range(1, 9)]  # more than the queue holds
+    with pytest.raises(OSError, match="disk full"):
+        dl.download_slots(slots, len(slots), _fake_ctx(tmp_path, jobs=2))
+
+
+def test_schedule_fetches_waits_for_a_busy_thread_instead_of_spinning(monkeypatch):
+    import time
+
+    import youtube_music_dl.downloader as dl
+
+    monkeypatch.setattr(dl, "DEFERRED_RETRY_DELAYS_S", (0.0,))
+    monkeypatch.setattr(dl, "jitter", lambda delay_s: delay_s)
+    waits = []
+
+    def counting_wait(*args, **kwargs):
+        waits.append(kwargs.get("timeout"))
+        return wait(*args, **kwargs)
+
+    wait = dl.wait
+    monkeypatch.setattr(dl, "wait", counting_wait)
+
+    def fetch(position, slot):
+        if position == 0 and slot.tries == 0:
+            return slot._replace(tries=1)  # due again at once, but the only thread is busy with the other slot
+        time.sleep(0.2 if position == 1 else 0)
+        return None
+
+    dl.schedule_fetches([dl.Pending("https://y/1", 1), dl.Pending("https://y/2", 2)], fetch, 1)
+    assert len(waits) <= 4  # one per finished fetch, not one per pass of a spinning loop
+
+
+def test_do_chapters_parallel_keeps_order_and_per_chapter_errors(monkeypatch, tmp_path: Path):
+    import threading
+
+    import youtube_music_dl.downloader as dl
+
+    source = tmp_path / "src.opus"
+    source.touch()
+    monkeypatch.setattr(dl, "download_audio", lambda *a, **k: dl.Outcome(({"id": "SRC"}, source)))
+    monkeypatch.setattr(dl, "media_duration_s", lambda path: 70.0)
+    monkeypatch.setattr(dl, "tag_audio", lambda path, **tags: None)
+    batches: list[list[str]] = []
+    lock = threading.Lock()
+
+    def fake_split_chapters(src, chapters, dests):
+        with lock:
+            batches.append([c.title for c in chapters])
+        return [ValueError("bad bounds") if c.title == "T4" else None for c in chapters]
+
+    monkeypatch.setattr(dl, "split_chapters", fake_split_chapters)
+    top = {"id": "SRC", "chapters": [{"title": f"T{i}", "start_time": (i - 1) * 10} for i in range(1, 8)]}
+
+    tracks, _ = dl.do_chapters("https://y/SRC", top, "", _fake_ctx(tmp_path, jobs=3))
+    assert [t.index for t in tracks] == list(range(1, 8))
+    assert sorted(batches) == [["T1", "T2", "T3"], ["T4", "T5", "T6"], ["T7"]]  # one ffmpeg pass per worker
+    assert tracks[3].status == "failed" and tracks[3].error == dl.TrackError("bad bounds", False)
+    assert all(t.status == "downloaded" for i, t in enumerate(tracks) if i != 3)
+
+
+def test_downloader_rejects_bad_jobs():
+    with pytest.raises(UserError) as e:
+        downloader(urls=["x"], artist="a", jobs=0)
+    assert e.value.code == "INVALID_ARGS"
+
+
+# --- one extraction per video (fake yt-dlp, no network) --------------------
+
+
+class FakeYoutubeDL:
+    """Stands in for `yt_dlp.YoutubeDL`: counts extractions, and "downloads" by writing an empty `<id>.<ext>`."""
+
+    extractions: list[str] = []
+    processed: list[str] = []
+    instances: int = 0
+    throttled_downloads: int = 0  # how many of the next downloads YouTube throttles, whatever the video
+
+    def __init__(self, params):
+        self.params = params
+        self.progress_hooks = []
+        FakeYoutubeDL.instances += 1
+
+    def add_progress_hook(self, hook):
+        self.progress_hooks.append(hook)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        pass
+
+    @staticmethod
+    def sanitize_info(info, remove_private_keys=False):
+        return dict(info)
+
+    def _info(self, video_id: str) -> dict:
+        return {"id": video_id, "title": f"Song {video_id}", "extractor": "youtube", "formats": [{"format_id": "251"}]}
+
+    def _download(self, info: dict) -> dict | None:
+        if FakeYoutubeDL.throttled_downloads > 0:
+            FakeYoutubeDL.throttled_downloads -= 1
+            self.params["logger"].error(f"ERROR: [youtube] {info['id']}: HTTP Error 429: Too Many Requests")
+            return None
+        outtmpl = self.params.get("outtmpl")
+        if outtmpl:
+            for status in ("downloading", "downloading", "finished"):
+                for hook in self.progress_hooks:
+                    hook({"status": status, "downloaded_bytes": 512, "total_bytes": 1024, "speed": 2048.0})
+            Path(outtmpl.replace("%(id)s", info["id"]).replace("%(ext)s", "opus")).touch()
+        return {**info, "acodec": "opus"}
+
+    def extract_info(self, url, download=True):
+        video_id = url.rsplit("=", 1)[-1]
+        self.extractions.append(video_id)
+        if video_id.startswith("private"):
+            self.params["logger"].error(f"ERROR: [youtube] {video_id}: Private video")
+            return None
+        if video_id.startswith("throttled") and self.extractions.count(video_id) <= 2:
+            self.params["logger"].error(f"ERROR: [youtube] {video_id}: HTTP Error 429: Too Many Requests")
+            return None
+        info = self._info(video_id)
+        return self._download(info) if download else info
+
+    def process_ie_result(self, info, download=True):
+        self.processed.append(info["id"])
+        return self._download(info)
+
+
+@pytest.fixture
+def fake_ytdl(monkeypatch):
+    import types
+
+    import yt_dlp.utils
+
+    import youtube_music_dl.downloader as dl
+
+    FakeYoutubeDL.extractions = []
+    FakeYoutubeDL.processed = []
+    FakeYoutubeDL.instances = 0
+    FakeYoutubeDL.throttled_downloads = 0
+    monkeypatch.setattr(dl, "SESSION", dl.YdlSession())
+    fake_module = types.SimpleNamespace(YoutubeDL=FakeYoutubeDL, utils=yt_dlp.utils)
+    monkeypatch.setattr(dl, "youtube_dl", lambda: fake_module)
+    monkeypatch.setattr(dl, "tag_audio", lambda path, **tags: None)
+    monkeypatch.setattr(dl, "RATE_LIMITER", RateLimiter(0, 1))  # off, unless a test installs its own
+    monkeypatch.setattr(dl, "DEFERRED_RETRY_DELAYS_S", (0.01, 0.01))
+    monkeypatch.setattr(dl, "jitter", lambda delay_s: delay_s)
+    return FakeYoutubeDL
+
+
+def test_single_songs_extract_each_video_once(fake_ytdl, tmp_path: Path):
+    result = downloader(
+        urls=["https://y/watch?v=aaa", "https://y/watch?v=bbb"], artist="A", album="B", output_dir=str(tmp_path)
+    )
+    assert [t["status"] for t in result["tracks"]] == ["downloaded", "downloaded"]
+    # one extraction each (the probe); the download reuses it instead of extracting again
+    assert fake_ytdl.extractions == ["aaa", "bbb"]
+    assert fake_ytdl.processed == ["aaa", "bbb"]
+
+
+def test_session_reuses_youtubedl_and_keeps_errors_per_call(fake_ytdl):
+    import youtube_music_dl.downloader as dl
+
+    opts = dl.probe_opts()
+    ok = dl.probe_once("https://y/watch?v=aaa", opts)
+    private = dl.probe_once("https://y/watch?v=private1", opts)
+    again = dl.probe_once("https://y/watch?v=bbb", opts)
+
+    assert fake_ytdl.instances == 1  # one YoutubeDL served all three extractions
+    assert ok.value and ok.error == ""
+    assert private.value is None and "Private video" in private.error
+    assert again.value and again.error == ""  # the previous call's error didn't leak into this one
+
+
+def test_probe_cache_answers_repeat_probes(fake_ytdl, capfd):
+    import youtube_music_dl.downloader as dl
+
+    first = dl.probe("https://y/watch?v=aaa", dl.probe_opts())
+    again = dl.probe("https://y/watch?v=aaa", dl.probe_opts())
+    assert first.value and again.value and again.value["id"] == "aaa"
+    assert fake_ytdl.extractions == ["aaa"]  # the second probe never reached yt-dlp
+    err = capfd.readouterr().err
+    assert "probe cache miss" in err and "probe cache hit" in err
+
+    dl.probe("https://y/watch?v=aaa", dl.probe_opts("1-3"))  # other playlist items -> another entry
+    dl.probe("https://y/watch?v=aaa", dl.probe_opts(), cache=False)  # bypassed
+    assert fake_ytdl.extractions == ["aaa", "aaa", "aaa"]
+    dl.probe("https://y/watch?v=private1", dl.probe_opts())
+    dl.probe("https://y/watch?v=private1", dl.probe_opts())
+    assert fake_ytdl.extractions.count("private1") == 2  # failures aren't cached
+
+
+class FakeClock:
+    """A clock that only moves when slept on, so rate-limit tests neither wait nor flake."""
+
+    def __init__(self) -> None:
+        self.now_s = 0.0
+        self.slept_s: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now_s
+
+    def sleep(self, seconds: float) -> None:
+        self.slept_s.append(seconds)
+        self.now_s += seconds
+
+
+def test_rate_limiter_spends_the_burst_then_paces():
+    clock = FakeClock()
+    limiter = RateLimiter(2.0, 3, clock=clock, sleep=clock.sleep)
+    assert [limiter.acquire() for _ in range(3)] == [0.0, 0.0, 0.0]  # the burst goes out back to back
+    assert limiter.acquire() == pytest.approx(0.5)  # then one per 1/rate seconds
+    limiter.throttled()
+    assert limiter.current_rate_per_s() == 1.0
+    assert limiter.acquire() == pytest.approx(1.0)  # half the rate, and no burst left to spend
+    for _ in range(10):
+        limiter.succeeded()
+    assert limiter.current_rate_per_s() == 2.0  # recovered, but never past the configured rate
+    assert not RateLimiter(0, 1).acquire()  # a rate of 0 turns limiting off
+
+
+def test_rate_limiter_state_file_is_shared_between_limiters(tmp_path: Path):
+    clock = FakeClock()
+    state_file = tmp_path / "ratelimit.json"
+    first, second = (RateLimiter(1.0, 2, state_file, clock=clock, sleep=clock.sleep) for _ in range(2))
+    first.acquire()
+    second.acquire()
+    assert second.acquire() == pytest.approx(1.0)  # the second one waits on the first one's spending
+    first.throttled()
+    assert second.current_rate_per_s() == 0.5
+    assert json.loads(state_file.read_text())["rate"] == 0.5
+
+
+def test_malformed_rate_limit_env_falls_back_to_the_default():
+    import os
+
+    from youtube_music_dl.ratelimit import RATE_LIMIT_ENV
+
+    env = {**os.environ, RATE_LIMIT_ENV: "fast"}
+    proc = subprocess.run(
+        [sys.executable, "-m", "youtube_music_dl.command_line", "--version"], capture_output=True, text=True, env=env
+    )
+    assert proc.returncode == 0 and "version" in json.loads(proc.stdout)
+    assert RATE_LIMIT_ENV in proc.stderr
+
+
+def test_throttling_slows_every_request_down(fake_ytdl, monkeypatch, tmp_path: Path, capfd):
+    import youtube_music_dl.downloader as dl
+
+    clock = FakeClock()
+    monkeypatch.setattr(dl, "RATE_LIMITER", RateLimiter(2.0, 1, clock=clock, sleep=clock.sleep))
+    monkeypatch.setattr(dl.time, "sleep", clock.sleep)
+    monkeypatch.setattr(dl, "jitter", lambda delay_s: delay_s)
+    assert is_throttling("ERROR: HTTP Error 429: Too Many Requests")
+    assert is_throttling("Sign in to confirm you're not a bot")
+    assert not is_throttling("ERROR: Private video")
+
+    # throttled twice, then let through by the last retry; no --cache, so every probe really goes out
+    result = downloader(
+        urls=["https://y/watch?v=throttled1"], artist="A", album="B", output_dir=str(tmp_path), cache=False
+    )
+    assert [t["status"] for t in result["tracks"]] == ["downloaded"]
+    assert fake_ytdl.extractions == ["throttled1"] * 3
+    assert "slowing down" in capfd.readouterr().err
+    # the limiter halved its rate twice, and the retries waited on it on top of their own backoff
+    assert dl.RATE_LIMITER.current_rate_per_s() < 2.0
+    assert sum(clock.slept_s) > sum(dl.RETRY_DELAYS_S)
+
+
+def test_failed_downloads_are_retried_after_the_other_tracks(fake_ytdl, tmp_path: Path, capfd):
+    import io
+
+    import youtube_music_dl.downloader as dl
+    from youtube_music_dl.events import EventSink, emitting
+
+    top = {"entries": [{"id": i, "title": i} for i in ("throttled1", "aaa", "private1", "bbb")]}
+    stream = io.StringIO()
+    with emitting(EventSink(stream)):
+        tracks = dl.do_playlist(top, _fake_ctx(tmp_path), "")
+    # the throttled track's retries wait until everything else has had its first try, instead of holding it up; the
+    # private video isn't retried at all
+    assert fake_ytdl.extractions == ["throttled1", "aaa", "private1", "bbb", "throttled1", "throttled1"]
+    assert [t.status for t in tracks] == ["downloaded", "downloaded", "failed", "downloaded"]
+    assert tracks[2].error == dl.track_error("ERROR: [youtube] private1: Private video")
+    assert "retrying in 0.0s, after other tracks" in capfd.readouterr().err
+    retries = [e for e in map(json.loads, stream.getvalue().splitlines()) if e["event"] == "retrying"]
+    # like a retry within the call, each says what yt-dlp said
+    assert len(retries) == 2 and all("throttled1" in e["error"] for e in retries)
+
+
+def test_circuit_breaker_pauses_the_run_instead_of_failing_the_rest_of_it(fake_ytdl, tmp_path, capfd):
+    import youtube_music_dl.downloader as dl
+
+    fake_ytdl.throttled_downloads = 5
+    breaker = CircuitBreaker(threshold=5, cool_downs_s=(0.2,))
+    top = {"entries": [{"id": f"v{i}", "title": f"T{i}"} for i in range(1, 5)]}
+
+    tracks = dl.do_playlist(top, _fake_ctx(tmp_path, breaker=breaker), "")
+    # every first try and the first retry failed, which opened the breaker; the next retry waited out the cool-down as
+    # the canary, and went through, and so did everything after it
+    assert [t.status for t in tracks] == ["downloaded"] * 4
+    assert breaker.paused_s >= 0.2
+    err = capfd.readouterr().err
+    assert "pausing all requests for 0.2s" in err and "canary request went through" in err
+
+
+def test_circuit_breaker_gives_up_pausing_when_the_canaries_keep_failing():
+    breaker = CircuitBreaker(threshold=2, cool_downs_s=(0.01, 0.02))
+    for _ in range(2):
+        assert not breaker.wait()
+        breaker.record(ok=False, permanent=False, canary=False)
+    breaker.record(ok=False, permanent=True, canary=False)  # in flight when it opened: doesn't count
+    for _ in range(2):
+        assert breaker.wait()  # after each cool-down, one canary...
+        breaker.record(ok=False, permanent=False, canary=True)  # ...which fails
+    assert not breaker.wait()  # out of cool-downs: requests go straight out again
+    assert breaker.paused_s >= 0.03
+    for _ in range(5):
+        breaker.record(ok=False, permanent=False, canary=False)
+    assert not breaker.wait()  # and it stays that way for the rest of the run
+
+
+def test_circuit_breaker_canary_that_raises_frees_the_others():
+    import threading
+
+    import youtube_music_dl.downloader as dl
+
+    breaker = CircuitBreaker(threshold=1, cool_downs_s=(0.01,))
+    breaker.record(ok=False, permanent=False, canary=False)  # open
+
+    def crash() -> dl.Outcome[dl.Info]:
+        raise OSError("disk full")
+
+    with pytest.raises(OSError):
+        dl.with_retries(crash, "x", breaker, delays_s=())  # the canary never got an outcome to record
+    canaries: list[bool] = []
+    waiter = threading.Thread(target=lambda: canaries.append(breaker.wait()), daemon=True)
+    waiter.start()
+    waiter.join(timeout=5)
+    assert canaries == [True]  # the next request out is the canary, rather than waiting on the first forever
+
+
+def test_probe_cache_expires_and_evicts_least_recently_used(tmp_path: Path):
+    import os
+
+    from youtube_music_dl.cache import ProbeCache
+
+    info = {"id": "x", "padding": "p" * 1000}
+    cache = ProbeCache(tmp_path, ttl_s=60, max_bytes=2500)
+    for i, url in enumerate(["a", "b", "c"]):
+        cache.put(url, {}, info)
+        os.utime(cache.path(url, {}), (1000 + i, 1000 + i))
+    assert cache.get("a", {}) is None  # expired (mtime long past the TTL), and removed
+    assert not cache.path("a", {}).exists()
+
+    cache.ttl_s = 10**12
+    assert cache.get("b", {}) == info  # a hit marks "b" as the most recently used
+    cache.put("d", {}, info)  # over budget: "c" goes, as the least recently used
+    assert [cache.get(url, {}) is not None for url in "bcd"] == [True, False, True]
+    assert ProbeCache(tmp_path, ttl_s=0, max_bytes=2500).get("b", {}) is None  # a TTL of 0 turns the cache off
+
+
+def test_probe_cache_ignores_malformed_env(monkeypatch, capsys):
+    from youtube_music_dl.cache import (
+        DEFAULT_PROBE_CACHE_TTL_S,
+        PROBE_CACHE_MAX_MB_ENV,
+        PROBE_CACHE_TTL_ENV,
+        ProbeCache,
+    )
+
+    monkeypatch.setenv(PROBE_CACHE_TTL_ENV, "1h")
+    monkeypatch.setenv(PROBE_CACHE_MAX_MB_ENV, "2")
+    cache = ProbeCache.from_env()
+    assert cache.ttl_s == DEFAULT_PROBE_CACHE_TTL_S and cache.max_bytes == 2 * 1024 * 1024
+    assert PROBE_CACHE_TTL_ENV in capsys.readouterr().err
+
+
+# --- plan files (no network) -----------------------------------------------
+
+
+def test_plan_round_trip_runs_without_a_top_level_extraction(monkeypatch, tmp_path: Path):
+    import youtube_music_dl.downloader as dl
+
+    top = {"extractor": "youtube:tab", "title": "Mix", "entries": [{"id": "v01", "title": "A"}, None]}
+    monkeypatch.setattr(dl, "probe", lambda url, opts, cache=True: dl.Outcome(top))
+    report = dl.probe_urls(["https://y/list"], plan_out=str(tmp_path / "plan.json"), audio_format="m4a")
+    schema.validate_probe(report)
+
+    plan = dl.load_plan(str(tmp_path / "plan.json"))
+    assert plan["mode"] == "playlist" and plan["format"] == "m4a"
+    assert [e["youtube_video_id"] for e in plan["entries"]] == ["v01", None]  # the unlistable entry keeps its slot
+
+    monkeypatch.setattr(dl, "probe", lambda *a, **k: pytest.fail("re-probed a planned URL"))
+    monkeypatch.setattr(
+        dl, "fetch_track", lambda p, ctx: dl.Downloaded(p.url, p.index, {"id": "v01", "title": "A"}, tmp_path / "x")
+    )
+    monkeypatch.setattr(
+        dl, "finish_track", lambda d, total, ctx: dl.Track(d.index, "downloaded", "A", "v01", d.url, "/f")
+    )
+    result = downloader(urls=[], artist="X", output_dir=str(tmp_path), plan=plan)
+    assert result["album"] == "Mix" and result["format"] == "m4a"
+    assert [t["status"] for t in result["tracks"]] == ["downloaded", "failed"]
+
+
+def test_plan_pins_the_chapters_file(monkeypatch, tmp_path: Path):
+    import youtube_music_dl.downloader as dl
+
+    chapters = tmp_path / "ch.csv"
+    chapters.write_text("Alpha,0,12\nBravo,12,24\n")
+    top = {"extractor": "youtube", "id": "SRC", "title": "Album", "duration": 24, "chapters": [{"start_time": 0}]}
+    plan = dl.make_plan(["https://y/SRC"], top, "chapters", str(chapters), "opus")
+    schema.validate_plan(plan)
+    assert [c["title"] for c in plan["chapters"]] == ["Alpha", "Bravo"]  # the file's, not the video's own
+    assert dl.plan_top(plan)["chapters"] == plan["chapters"] and dl.plan_top(plan)["id"] == "SRC"
+
+
+def test_load_plan_rejects_a_bad_plan(tmp_path: Path):
+    from youtube_music_dl.downloader import load_plan
+
+    path = tmp_path / "plan.json"
+    for text in ("{not json", json.dumps({"version": schema.SCHEMA_VERSION, "kind": "probe"})):
+        path.write_text(text)
+        with pytest.raises(UserError) as e:
+            load_plan(str(path))
+        assert e.value.code == "INVALID_ARGS"
+
+
+# --- resuming interrupted runs (no network) ----------------------------------
+
+
+def test_load_journal_keeps_the_latest_state_and_skips_a_torn_line(tmp_path: Path):
+    from youtube_music_dl.journal import JOURNAL_NAME, JournalEntry, load_journal
+
+    lines = [
+        json.dumps(JournalEntry(1, "queued", "u1")._asdict()),
+        json.dumps(JournalEntry(1, "downloaded", "u1", "v1", "A", "/v1.opus")._asdict()),
+        json.dumps(JournalEntry(2, "bogus", "u2")._asdict()),
+        '{"index": 2, "state": "tagg',  # killed mid-write
+    ]
+    (tmp_path / JOURNAL_NAME).write_text("\n".join(lines))
+    assert load_journal(tmp_path / JOURNAL_NAME) == {1: JournalEntry(1, "downloaded", "u1", "v1", "A", "/v1.opus")}
+
+
+def test_playlist_resumes_each_track_from_its_journaled_state(monkeypatch, tmp_path: Path):
+    import youtube_music_dl.downloader as dl
+    from youtube_music_dl.journal import JournalEntry, RunJournal
+
+    url = dl.video_url
+    (tmp_path / "01 - A.opus").touch()
+    (tmp_path / "02 - B.opus").touch()
+    (tmp_path / "v3.opus").touch()
+    interrupted = RunJournal(tmp_path)
+    interrupted.record(JournalEntry(1, "tagged", url("v1"), "v1", "A", str(tmp_path / "01 - A.opus")))
+    interrupted.record(JournalEntry(2, "finalized", url("v2"), "v2", "B", str(tmp_path / "02 - B.opus")))
+    interrupted.record(JournalEntry(3, "downloaded", url("v3"), "v3", "C", str(tmp_path / "v3.opus")))
+    interrupted.record(JournalEntry(4, "downloading", url("v4"), None))
+    interrupted.close(completed=False)
+
+    fetched: list[int] = []
+    tagged: list[str] = []
+
+    def fake_fetch_track(pending, ctx):
+        fetched.append(pending.index)
+        (tmp_path / "v4.opus").touch()
+        return dl.Downloaded(pending.url, pending.index, {"id": "v4", "title": "D"}, tmp_path / "v4.opus")
+
+    monkeypatch.setattr(dl, "fetch_track", fake_fetch_track)
+    monkeypatch.setattr(dl, "tag_audio", lambda path, **tags: tagged.append(path.name))
+    top = {"entries": [{"id": f"v{i}", "title": t} for i, t in enumerate("ABCD", 1)]}
+
+    journal = RunJournal(tmp_path)
+    tracks = dl.do_playlist(top, _fake_ctx(tmp_path, journal=journal), "")
+    assert fetched == [4]  # only the track that never finished downloading is downloaded again
+    assert sorted(tagged) == ["02 - B.opus", "03 - C.opus", "04 - D.opus"]
+    assert [t.status for t in tracks] == ["downloaded"] * 4
+    assert [Path(t.file or "").name for t in tracks] == ["01 - A.opus", "02 - B.opus", "03 - C.opus", "04 - D.opus"]
+    journal.close(completed=True)
+    assert not journal.path.exists()
+
+
+def test_interrupted_run_resumes_without_reprobing(fake_ytdl, monkeypatch, tmp_path: Path):
+    import youtube_music_dl.downloader as dl
+    from youtube_music_dl.journal import JOURNAL_NAME
+
+    def tag_then_interrupt(path, **tags):
+        if tags["youtube_video_id"] == "bbb":
+            raise KeyboardInterrupt
+
+    monkeypatch.setattr(dl, "tag_audio", tag_then_interrupt)
+    urls = ["https://y/watch?v=aaa", "https://y/watch?v=bbb"]
+    run: dict[str, Any] = dict(urls=urls, artist="A", album="B", output_dir=str(tmp_path), cache=False)
+    with pytest.raises(KeyboardInterrupt):
+        downloader(**run)
+    album = tmp_path / "A" / "B"
+    assert (album / JOURNAL_NAME).exists()
+
+    monkeypatch.setattr(dl, "tag_audio", lambda path, **tags: None)
+    fake_ytdl.extractions.clear()
+    result = downloader(**run)
+    assert [t["status"] for t in result["tracks"]] == ["downloaded", "downloaded"]
+    assert fake_ytdl.extractions == ["aaa"]  # the top-level probe; "bbb" was downloaded and only needed its tags
+    assert not (album / JOURNAL_NAME).exists()  # a completed run clears it
+
+
+# --- progress events (fake yt-dlp, no network) ------------------------------
+
+
+def test_events_stream_each_track_and_match_the_result(fake_ytdl, tmp_path: Path):
+    import io
+
+    from youtube_music_dl.events import EventSink, emitting
+
+    stream = io.StringIO()
+    with emitting(EventSink(stream)):
+        result = downloader(
+            urls=["https://y/watch?v=aaa", "https://y/watch?v=private1", "https://y/watch?v=bbb"],
+            artist="A",
+            album="B",
+            output_dir=str(tmp_path),
+            jobs=2,
+        )
+    events = [json.loads(line) for line in stream.getvalue().splitlines()]
+    for event in events:
+        schema.validate_event(event)
+    kinds = [e["event"] for e in events]
+    assert kinds.count("track_started") == 2 and kinds.count("track_done") == 3  # the private video never starts
+    # throttled: the two "downloading" statuses land within one interval, so one of them is dropped
+    assert kinds.count("track_progress") == 4
+    done = {
+        e["index"]: {k: v for k, v in e.items() if k not in ("version", "event", "ts")}
+        for e in events
+        if e["event"] == "track_done"
+    }
+    assert [done[t["index"]] for t in result["tracks"]] == result["tracks"]  # track_done is the result's track
+    schema.validate_result(result)
+
+
+# --- batch manifests (fake yt-dlp, no network) ------------------------------
+
+
+def test_batch_reports_every_album_and_keeps_going_past_failures(fake_ytdl, tmp_path: Path):
+    import youtube_music_dl.downloader as dl
+
+    manifest = [
+        json.dumps({"urls": ["https://y/watch?v=aaa"], "artist": "A", "album": "One"}),
+        "",
+        "{not json",
+        json.dumps({"urls": ["https://y/watch?v=bbb"], "artist": "A"}),  # single song without an album
+        json.dumps({"urls": ["https://y/watch?v=ccc"], "artist": "A", "album": "Two", "bogus": 1}),
+        json.dumps({"urls": ["https://y/watch?v=ddd"], "artist": "B", "album": "Three"}),
+    ]
+    results = {r["manifest_line"]: r for r in dl.batch(manifest, jobs=2, defaults={"output_dir": str(tmp_path)})}
+    assert set(results) == {1, 3, 4, 5, 6}  # the blank line isn't an album
+    for r in results.values():
+        if "error" in r:
+            schema.validate_error(r)
+        else:
+            schema.validate_result(r)
+    assert results[1]["ok"] and results[1]["directory"] == str(tmp_path / "A" / "One")
+    assert results[6]["ok"]
+    assert [results[n]["error"]["code"] for n in (3, 4, 5)] == ["INVALID_ARGS", "ALBUM_REQUIRED", "INVALID_ARGS"]
+
+
+def test_batch_caps_downloads_across_albums(fake_ytdl, monkeypatch, tmp_path: Path):
+    import threading
+    import time
+
+    import youtube_music_dl.downloader as dl
+
+    active: list[int] = [0]
+    peak: list[int] = [0]
+    lock = threading.Lock()
+    download = FakeYoutubeDL._download
+
+    def slow_download(self, info):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.02)
+        with lock:
+            active[0] -= 1
+        return download(self, info)
+
+    monkeypatch.setattr(FakeYoutubeDL, "_download", slow_download)
+    manifest = [
+        json.dumps({"urls": [f"https://y/watch?v={a}{i}" for i in range(3)], "artist": "A", "album": a, "jobs": 3})
+        for a in ("x", "y", "z")
+    ]
+    results = list(dl.batch(manifest, jobs=2, defaults={"output_dir": str(tmp_path)}))
+    assert all(r["ok"] for r in results) and len(results) == 3
+    assert peak[0] == 2  # each album asked for 3 at once, but the batch allows 2 in all
+
+
+def test_interrupted_batch_starts_no_more_albums(monkeypatch, tmp_path: Path):
+    import youtube_music_dl.downloader as dl
+    from youtube_music_dl.journal import RunJournal, close_open_journals
+
+    started: list[str] = []
+    monkeypatch.setattr(dl, "run_manifest_line", lambda line, defaults: started.append(line) or {"ok": True})
+    albums = dl.batch(["a", "b", "c", "d"], jobs=1)
+    next(albums)
+    albums.close()  # what main_batch does on Ctrl-C
+    assert len(started) <= 2  # the first album, and at most the one already running
+
+    journal = RunJournal(tmp_path)
+    journal.record(dl.JournalEntry(1, "queued", "https://y/watch?v=a"))
+    close_open_journals()
+    assert journal._fh is None and list(RunJournal(tmp_path).resumable) == [1]  # closed, and kept to resume
+
+
+# --- library-wide dedupe (no network) --------------------------------------
+
+
+def _fake_library(monkeypatch, root: Path, layout: dict[str, str]) -> None:
+    """Create dummy audio files at `layout`'s relative paths, each "tagged" with the mapped video id."""
+    from youtube_music_dl import tagging
+
+    ids = {}
+    for rel, video_id in layout.items():
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(video_id.encode())
+        ids[path.name] = video_id
+    monkeypatch.setattr(tagging, "read_provenance", lambda path: ids.get(path.name))
+
+
+def test_library_index_queries(monkeypatch, tmp_path: Path):
+    from youtube_music_dl.library import LibraryIndex
+
+    _fake_library(
+        monkeypatch,
+        tmp_path,
+        {
+            "Artist A/Album 1/01 - x.opus": "X",
+            "Artist A/Album 2/01 - y.opus": "Y",
+            "Artist B/Comp/03 - x.opus": "X",
+            "Loose Album/01 - z.mp3": "Z",  # no artist level
+            "Artist B/Mix/01 - p1.opus": "MIX",  # a chapter split: several files, one id
+            "Artist B/Mix/02 - p2.opus": "MIX",
+        },
+    )
+    library = LibraryIndex.load(tmp_path)
+    assert library.albums_with("X") == [tmp_path / "Artist A" / "Album 1", tmp_path / "Artist B" / "Comp"]
+    assert library.ids_under(tmp_path / "Artist A") == {"X", "Y"}
+    assert library.files("Z") == [tmp_path / "Loose Album" / "01 - z.mp3"]
+
+    here = tmp_path / "Artist C" / "New"
+    assert library.reusable_file("X", ".opus", here) == tmp_path / "Artist A" / "Album 1" / "01 - x.opus"
+    assert (
+        library.reusable_file("X", ".opus", tmp_path / "Artist A" / "Album 1")
+        == tmp_path / "Artist B" / "Comp" / "03 - x.opus"
+    )
+    assert library.reusable_file("X", ".m4a", here) is None  # wrong format
+    assert library.reusable_file("MIX", ".opus", here) is None  # a chapter isn't the whole video
+
+
+def test_playlist_reuses_a_video_from_another_album(monkeypatch, tmp_path: Path):
+    import youtube_music_dl.downloader as dl
+    from youtube_music_dl.library import LibraryIndex
+
+    _fake_library(monkeypatch, tmp_path, {"Artist/Other/05 - Song.opus": "vid01"})
+    tagged: dict[str, dict] = {}
+    monkeypatch.setattr(dl, "tag_audio", lambda path, **tags: tagged.update({path.name: tags}))
+    monkeypatch.setattr(dl, "fetch_track", lambda pending, ctx: pytest.fail("downloaded a video the library has"))
+    album = tmp_path / "Artist" / "Comp"
+    album.mkdir()
+
+    ctx = _fake_ctx(album, library=LibraryIndex.load(tmp_path))
+    [track] = dl.do_playlist({"entries": [{"id": "vid01", "title": "Song"}]}, ctx, "")
+    assert track.status == "downloaded" and track.file == str(album / "01 - Song.opus")
+    assert (album / "01 - Song.opus").read_bytes() == b"vid01"  # a copy...
+    assert (tmp_path / "Artist" / "Other" / "05 - Song.opus").exists()  # ...the original stays put
+    assert tagged["01 - Song.opus"]["album"] == "Album" and tagged["01 - Song.opus"]["tracknumber"] == "1/1"
+
+
+def test_failed_library_reuse_falls_back_to_downloading(monkeypatch, tmp_path: Path):
+    import youtube_music_dl.downloader as dl
+    from youtube_music_dl.library import LibraryIndex
+
+    _fake_library(
+        monkeypatch, tmp_path, {"Artist/Other/05 - Song.opus": "vid01", "Artist/Other/06 - Two.opus": "vid02"}
+    )
+    album = tmp_path / "Artist" / "Comp"
+    album.mkdir()
+    clone_file = dl.clone_file
+
+    def flaky_clone(src: Path, dest: Path) -> None:
+        if src.name == "05 - Song.opus":
+            dest.write_bytes(b"partial")
+            raise OSError(28, "No space left on device")
+        clone_file(src, dest)
+
+    def failing_tag(path: Path, **tags) -> None:
+        raise OSError("tagging failed")
+
+    monkeypatch.setattr(dl, "clone_file", flaky_clone)
+    monkeypatch.setattr(dl, "tag_audio", failing_tag)
+    monkeypatch.setattr(dl, "download_slots", lambda slots, total, ctx: slots)
+    ctx = _fake_ctx(album, library=LibraryIndex.load(tmp_path))
+    entries = [{"id": "vid01", "title": "Song"}, {"id": "vid02", "title": "Two"}]
+    slots = dl.do_playlist({"entries": entries}, ctx, "")
+    assert [type(slot) for slot in slots] == [dl.Pending, dl.Pending]  # both downloaded after all
+    assert list(album.iterdir()) == []  # neither the partial copy nor the untagged one is left behind
+
+
 # --- self-describing CLI flags (subprocess, no network) -------------------
 
 
@@ -455,11 +1383,47 @@ def _run_cli(*args: str) -> subprocess.CompletedProcess[str]:
     )
 
 
+def top_level_import_us(importtime_stderr: str) -> dict[str, int]:
+    """Each top-level module's cumulative time from `python -X importtime` ("import time: self | cumulative | name")."""
+    lines = re.finditer(r"(?m)^import time:\s+\d+ \|\s+(\d+) \| (\S+)$", importtime_stderr)
+    return {m[2]: int(m[1]) for m in lines}
+
+
+@pytest.mark.parametrize(
+    "argv", [["-c", "import youtube_music_dl.command_line"], ["-m", "youtube_music_dl.command_line", "--print-schema"]]
+)
+def test_cli_startup_defers_heavy_imports(argv: list[str]):
+    proc = subprocess.run([sys.executable, "-X", "importtime", *argv], capture_output=True, text=True)
+    assert proc.returncode == 0
+    assert not {"yt_dlp", "jsonschema", "mutagen"} & set(top_level_import_us(proc.stderr))
+
+
+def test_cli_startup_costs_less_than_importing_yt_dlp():
+    # Relative, so a slow or busy machine slows both sides alike; benchmarks/startup.py has the absolute numbers.
+    code = "import youtube_music_dl.command_line; import yt_dlp"
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True)
+    assert proc.returncode == 0
+    import_us = top_level_import_us(proc.stderr)
+    yt_dlp_us = import_us.pop("yt_dlp")
+    assert sum(import_us.values()) < yt_dlp_us
+
+
 def test_cli_print_schema():
     proc = _run_cli("--print-schema")
     assert proc.returncode == 0
     data = json.loads(proc.stdout)
-    assert set(data) == {"result", "error", "probe", "retag", "upgrade", "chapters_file"}
+    assert set(data) == {
+        "result",
+        "error",
+        "probe",
+        "plan",
+        "retag",
+        "retag_library",
+        "upgrade",
+        "chapters_file",
+        "batch_item",
+        "event",
+    }
 
 
 def test_cli_print_skill():
@@ -544,6 +1508,18 @@ def test_download_opts_per_format(tmp_path: Path):
     # an explicit quality applies to any format (forces a re-encode)
     assert download_opts(tmp_path, "opus", "128")["postprocessors"][0]["preferredquality"] == "128"
 
+    # tag_audio writes every tag itself, so yt-dlp doesn't rewrite the file to embed its own first
+    assert [pp["key"] for pp in download_opts(tmp_path, "opus", "")["postprocessors"]] == ["FFmpegExtractAudio"]
+
+
+def test_kept_tags():
+    from youtube_music_dl.downloader import kept_tags
+
+    url = "https://www.youtube.com/watch?v=abc"
+    assert kept_tags({"upload_date": "19660501", "webpage_url": url}) == {"date": "1966-05-01", "comment": url}
+    assert kept_tags({"upload_date": "NA"}) == {}
+    assert kept_tags({}) == {}
+
 
 def test_warn_if_transcoded(capsys):
     from youtube_music_dl.downloader import warn_if_transcoded
@@ -664,7 +1640,8 @@ def test_retag_schema_sample():
             "artist": "X",
             "album": "Y",
             "directory": "/abs/X/Y",
-            "files": [{"file": "/abs/X/Y/01 - a.opus", "youtube_video_id": "abc"}],
+            "dry_run": False,
+            "files": [{"file": "/abs/X/Y/01 - a.opus", "youtube_video_id": "abc", "changed": True, "in_place": True}],
         }
     )
 
@@ -701,6 +1678,7 @@ def test_retag_moves_and_retags(make_audio, tmp_path: Path):
     assert a["artist"] == ["New Artist"] and a["album"] == ["New Album"]
     assert a["title"] == ["A"] and a["tracknumber"] == ["1/2"]  # preserved
     assert read_provenance(files[0]) == "VID1"  # provenance preserved
+    assert all(f["in_place"] for f in result["files"])  # fit in the padding tag_audio reserved
 
 
 @requires_ffmpeg
@@ -720,6 +1698,173 @@ def test_retag_dest_exists_errors(make_audio, tmp_path: Path):
     assert e.value.code == "INVALID_ARGS"
 
 
+def test_tag_padding_keeps_later_edits_in_place(tmp_path: Path):
+    from mutagen.id3 import ID3
+
+    from youtube_music_dl.tagging import TAG_PADDING_BYTES, update_tags
+
+    # ID3 doesn't care what follows it, so a file of fake audio stands in for an mp3 without needing ffmpeg
+    path = tmp_path / "01 - A.mp3"
+    path.write_bytes(b"\xff" * 100_000)
+    # the first tagging has to make room for the tags (and reserves plenty more)
+    assert not tag_audio(path, title="A", artist="x", album="y", tracknumber="1/1", youtube_video_id="VID")
+    size = path.stat().st_size
+    assert size > 100_000 + TAG_PADDING_BYTES
+    assert update_tags(path, artist="Another Artist", album="A Much Longer Album Title Than Before").in_place
+    assert path.stat().st_size == size
+    assert ID3(path)["TALB"].text == ["A Much Longer Album Title Than Before"]
+    assert path.read_bytes().endswith(b"\xff" * 100_000)  # the "audio" untouched
+
+
+def _make_fake_mp3_album(base: Path, artist: str, album: str, count: int) -> Path:
+    album_dir = base / artist / album
+    album_dir.mkdir(parents=True)
+    for i in range(1, count + 1):
+        path = album_dir / f"{i:02d} - T{i}.mp3"
+        path.write_bytes(b"\xff" * 1000)  # see test_tag_padding_keeps_later_edits_in_place
+        tag_audio(path, title=f"T{i}", artist=artist, album=album, tracknumber=f"{i}/{count}", youtube_video_id=f"V{i}")
+    return album_dir
+
+
+def test_retag_dry_run_changes_nothing(tmp_path: Path):
+    album = _make_fake_mp3_album(tmp_path, "Artist", "Album", 3)
+    before = {f.name: f.read_bytes() for f in album.iterdir()}
+    result = retag(str(album), artist="New Artist", dry_run=True)
+    schema.validate_retag(result)
+    assert result["dry_run"] is True
+    assert result["directory"] == str(tmp_path / "New Artist" / "Album")  # where it would go
+    assert [(f["youtube_video_id"], f["changed"], f["in_place"]) for f in result["files"]] == [
+        ("V1", True, None),
+        ("V2", True, None),
+        ("V3", True, None),
+    ]
+    assert {f.name: f.read_bytes() for f in album.iterdir()} == before
+
+
+def test_retag_opens_each_file_once_in_parallel(monkeypatch, tmp_path: Path):
+    from youtube_music_dl import tagging
+
+    album = _make_fake_mp3_album(tmp_path, "Artist", "Album", 5)
+    opened: list[str] = []
+    open_tags = tagging.open_tags
+    monkeypatch.setattr(tagging, "open_tags", lambda path: opened.append(path.name) or open_tags(path))
+    result = retag(str(album), album="Album", artist="Artist", jobs=3)  # nothing to change: nothing saved
+    assert sorted(opened) == sorted(f.name for f in album.iterdir() if f.suffix == ".mp3")
+    assert [f["youtube_video_id"] for f in result["files"]] == ["V1", "V2", "V3", "V4", "V5"]
+    assert not any(f["changed"] for f in result["files"])
+
+    opened.clear()
+    result = retag(str(album), album="Other", jobs=3)
+    assert len(opened) == 5 and all(f["changed"] and f["in_place"] for f in result["files"])
+    opened.clear()
+    assert existing_files_by_id(tmp_path / "Artist" / "Other").keys() == {"V1", "V2", "V3", "V4", "V5"}
+    assert not opened  # retag kept the provenance index up to date
+
+    with pytest.raises(UserError) as e:
+        retag(str(tmp_path / "Artist" / "Other"), album="X", jobs=0)
+    assert e.value.code == "INVALID_ARGS"
+
+
+def _album_artists(album_dir: Path) -> set[str]:
+    from mutagen.easyid3 import EasyID3
+
+    return {EasyID3(f)["artist"][0] for f in album_dir.glob("*.mp3")}
+
+
+def test_retag_library_moves_every_album(tmp_path: Path):
+    from youtube_music_dl.downloader import retag_library
+    from youtube_music_dl.journal import RETAG_JOURNAL_NAME
+
+    for album in ("One", "Two"):
+        _make_fake_mp3_album(tmp_path, "Old Name", album, 2)
+    _make_fake_mp3_album(tmp_path, "Someone Else", "Three", 1)
+
+    dry = retag_library(str(tmp_path), from_artist="Old Name", artist="New Name", dry_run=True)
+    schema.validate_retag_library(dry)
+    assert [album["directory"] for album in dry["albums"]] == [str(tmp_path / "New Name" / a) for a in ("One", "Two")]
+    assert (tmp_path / "Old Name" / "One").is_dir() and not (tmp_path / "New Name").exists()
+
+    result = retag_library(str(tmp_path), from_artist="Old Name", artist="New Name", jobs=3)
+    schema.validate_retag_library(result)
+    assert result["recovery"] is None
+    assert all(f["changed"] for album in result["albums"] for f in album["files"])
+    assert not (tmp_path / "Old Name").exists()
+    assert (
+        _album_artists(tmp_path / "New Name" / "One") == _album_artists(tmp_path / "New Name" / "Two") == {"New Name"}
+    )
+    assert _album_artists(tmp_path / "Someone Else" / "Three") == {"Someone Else"}
+    assert not (tmp_path / RETAG_JOURNAL_NAME).exists()
+
+
+def test_retag_library_collision_changes_nothing(tmp_path: Path):
+    from youtube_music_dl.downloader import retag_library
+
+    for album in ("One", "Two"):
+        _make_fake_mp3_album(tmp_path, "Old Name", album, 1)
+    (tmp_path / "New Name" / "Two").mkdir(parents=True)
+    with pytest.raises(UserError) as e:
+        retag_library(str(tmp_path), from_artist="Old Name", artist="New Name")
+    assert e.value.code == "INVALID_ARGS" and str(tmp_path / "New Name" / "Two") in str(e.value)
+    assert (tmp_path / "Old Name" / "One").is_dir()  # not even the album without a collision moved
+    assert _album_artists(tmp_path / "Old Name" / "One") == {"Old Name"}
+
+
+def test_retag_library_interrupted_rolls_back_or_forward(monkeypatch, tmp_path: Path):
+    from youtube_music_dl import downloader as dl
+
+    def interrupt_library_retag() -> None:
+        move_album = dl.move_album
+        moves = []
+
+        def crash_after_one_move(src: Path, dest: Path) -> None:
+            if moves:
+                raise KeyboardInterrupt
+            moves.append(src)
+            move_album(src, dest)
+
+        with monkeypatch.context() as m:
+            m.setattr(dl, "move_album", crash_after_one_move)
+            with pytest.raises(KeyboardInterrupt):
+                dl.retag_library(str(tmp_path), from_artist="Old Name", artist="New Name")
+        assert (tmp_path / "New Name" / "One").is_dir() and (tmp_path / "Old Name" / "Two").is_dir()
+
+    from mutagen.easyid3 import EasyID3
+
+    def artist_tags() -> dict[str, list[str]]:
+        return {f"{f.parent.name}/{f.name}": list(EasyID3(f).get("artist") or []) for f in tmp_path.glob("*/*/*.mp3")}
+
+    for album in ("One", "Two"):
+        _make_fake_mp3_album(tmp_path, "Old Name", album, 2)
+    # Not every file of the artist's albums says just "Old Name", and a rollback has to put back what each one did
+    for name, artist in (("One/01 - T1.mp3", ["Old Name feat. Y"]), ("Two/02 - T2.mp3", ["old name", "Guest"])):
+        tags = EasyID3(tmp_path / "Old Name" / name)
+        tags["artist"] = artist
+        tags.save()
+    tags = EasyID3(tmp_path / "Old Name" / "Two" / "01 - T1.mp3")
+    del tags["artist"]
+    tags.save()
+    before = artist_tags()
+
+    interrupt_library_retag()
+    with pytest.raises(UserError) as e:  # it has to be dealt with first
+        dl.retag_library(str(tmp_path), from_artist="Old Name", artist="Other")
+    assert "--resume" in str(e.value)
+    result = dl.retag_library(str(tmp_path), recover="rollback")
+    schema.validate_retag_library(result)
+    assert (result["from_artist"], result["artist"]) == ("New Name", "Old Name")
+    assert not (tmp_path / "New Name").exists()
+    assert artist_tags() == before
+
+    interrupt_library_retag()
+    dl.retag_library(str(tmp_path), recover="resume")
+    assert not (tmp_path / "Old Name").exists()
+    assert (
+        _album_artists(tmp_path / "New Name" / "One") == _album_artists(tmp_path / "New Name" / "Two") == {"New Name"}
+    )
+    with pytest.raises(UserError):  # nothing left to resume
+        dl.retag_library(str(tmp_path), recover="resume")
+
+
 def test_retag_no_audio_errors(tmp_path: Path):
     empty = tmp_path / "Artist" / "Album"
     empty.mkdir(parents=True)
@@ -733,3 +1878,6 @@ def test_cli_retag_dispatch_errors_cleanly():
     assert proc.returncode == 1
     err = json.loads(proc.stdout)
     assert err["ok"] is False and err["error"]["code"] == "INVALID_ARGS"
+
+    proc = _run_cli("retag", "--library", "/definitely/not/here", "--album", "X")
+    assert proc.returncode == 1 and json.loads(proc.stdout)["error"]["code"] == "INVALID_ARGS"
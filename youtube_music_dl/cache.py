@@ -0,0 +1,121 @@
+"""
+On-disk cache of `probe` results, so the usual probe -> edit chapters -> run -> re-run loop asks YouTube for the same
+metadata once rather than every time.
+
+Entries are JSON files named by a hash of the URL and the options that change what yt-dlp returns. They expire after a
+TTL (format URLs in an extraction go stale within hours, so keep it short), and the cache is kept under a byte budget by
+evicting the least recently used entries; a hit refreshes an entry's mtime, which is what "recently used" means here.
+"""
+
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+CACHE_DIR_ENV = "YMD_CACHE_DIR"
+PROBE_CACHE_TTL_ENV = "YMD_PROBE_CACHE_TTL"
+PROBE_CACHE_MAX_MB_ENV = "YMD_PROBE_CACHE_MAX_MB"
+DEFAULT_PROBE_CACHE_TTL_S = 3600.0
+DEFAULT_PROBE_CACHE_MAX_MB = 64.0
+
+# The probe options that change what an extraction returns; anything else (logger, js runtimes) doesn't belong in a key.
+KEY_OPTS = ("playlist_items", "extract_flat")
+
+
+def log(message: str) -> None:
+    print(message, file=sys.stderr)
+
+
+def env_float(name: str, default: float) -> float:
+    """
+    `$name` as a number, or `default` when it's unset or empty. A malformed value is warned about and ignored rather
+    than raised: settings like these are read mid-run (or at import), where a typo shouldn't cost the whole run.
+    """
+    raw = os.environ.get(name)
+    if not raw:
+        return default
+    try:
+        return float(raw)
+    except ValueError:
+        log(f"ignoring ${name}={raw!r}, which isn't a number; using {default:g}")
+        return default
+
+
+def cache_dir() -> Path:
+    """`$YMD_CACHE_DIR`, else `$XDG_CACHE_HOME/youtube-music-dl`, else `~/.cache/youtube-music-dl`."""
+    explicit = os.environ.get(CACHE_DIR_ENV)
+    if explicit:
+        return Path(explicit).expanduser()
+    xdg = os.environ.get("XDG_CACHE_HOME")
+    return (Path(xdg) if xdg else Path.home() / ".cache") / "youtube-music-dl"
+
+
+class ProbeCache:
+    def __init__(self, directory: Path, ttl_s: float, max_bytes: int) -> None:
+        self.directory = directory
+        self.ttl_s = ttl_s
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "ProbeCache":
+        ttl_s = env_float(PROBE_CACHE_TTL_ENV, DEFAULT_PROBE_CACHE_TTL_S)
+        max_mb = env_float(PROBE_CACHE_MAX_MB_ENV, DEFAULT_PROBE_CACHE_MAX_MB)
+        return cls(cache_dir() / "probe", ttl_s, int(max_mb * 1024 * 1024))
+
+    def path(self, url: str, opts: dict[str, Any]) -> Path:
+        key = json.dumps({"url": url, **{k: opts.get(k) for k in KEY_OPTS}}, sort_keys=True)
+        return self.directory / f"{hashlib.sha256(key.encode()).hexdigest()}.json"
+
+    def get(self, url: str, opts: dict[str, Any]) -> dict[str, Any] | None:
+        if self.ttl_s <= 0:
+            return None
+        path = self.path(url, opts)
+        try:
+            if time.time() - path.stat().st_mtime > self.ttl_s:
+                path.unlink(missing_ok=True)
+                return None
+            info = json.loads(path.read_text())
+            os.utime(path)  # mark as recently used
+        except (OSError, ValueError):
+            return None
+        return info if isinstance(info, dict) else None
+
+    def put(self, url: str, opts: dict[str, Any], info: dict[str, Any]) -> None:
+        """Store `info` (already JSON-safe, e.g. via yt-dlp's `sanitize_info`), then evict down to the byte budget."""
+        if self.ttl_s <= 0:
+            return
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(suffix=".tmp", dir=self.directory)
+        except OSError:
+            return  # a cache that can't be written is just a miss next time
+        try:
+            with os.fdopen(fd, "w") as fh:
+                json.dump(info, fh)
+            os.replace(tmp, self.path(url, opts))
+        except (OSError, TypeError, ValueError):
+            Path(tmp).unlink(missing_ok=True)
+            return
+        self.evict()
+
+    def evict(self) -> None:
+        with self._lock:
+            entries: list[tuple[float, int, Path]] = []
+            for path in self.directory.glob("*.json"):
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
@@ -11,6 +11,12 @@ Contract for programmatic/agent use:
   (a result object is still emitted), `1` = fatal error (an error object is
   emitted). The tool is always non-interactive; re-runs are idempotent (already
   downloaded videos are skipped) unless `--force` is given.
+- `batch MANIFEST` is the exception: it writes one compact JSON object per line
+  (JSONL), a result or an error for each album as it finishes.
+- `--events` adds newline-delimited `schema.EVENT_SCHEMA` events as the run
+  goes. On stdout (the default), they precede the usual final object, which is
+  then written on one line too; with `--events-fd N` they go to file descriptor
+  N and stdout is unchanged.
 """
 
 import argparse
@@ -19,37 +25,43 @@ import os
 import shutil
 import subprocess
 import sys
-from importlib.metadata import PackageNotFoundError, version
-from importlib.resources import files
 from pathlib import Path
-from typing import Any
+from typing import Any, NoReturn
 
+from .cache import PROBE_CACHE_TTL_ENV
 from .downloader import (
     AUDIO_FORMATS,
     DEFAULT_AUDIO_FORMAT,
+    RETAG_JOBS,
+    SESSION,
     YT_DLP_SPEC,
     UserError,
+    batch,
     downloader,
+    load_plan,
     log,
     probe_urls,
     retag,
+    retag_library,
     ytdlp_upgrade_argv,
 )
+from .events import EventSink, emitting
+from .journal import close_open_journals
 from .schema import (
+    BATCH_ITEM_SCHEMA,
     CHAPTERS_FILE_SCHEMA,
     ERROR_SCHEMA,
+    EVENT_SCHEMA,
+    PLAN_SCHEMA,
     PROBE_SCHEMA,
     RESULT_SCHEMA,
+    RETAG_LIBRARY_SCHEMA,
     RETAG_SCHEMA,
     SCHEMA_VERSION,
     UPGRADE_SCHEMA,
     ErrorCode,
+    check_output,
     make_error,
-    validate_error,
-    validate_probe,
-    validate_result,
-    validate_retag,
-    validate_upgrade,
 )
 
 if sys.version_info < (3, 12):
@@ -57,6 +69,8 @@ if sys.version_info < (3, 12):
 
 
 def get_version() -> str:
+    from importlib.metadata import PackageNotFoundError, version  # a third of our import time; only --version needs it
+
     try:
         return version("youtube-music-dl")
     except PackageNotFoundError:
@@ -100,6 +114,8 @@ def resolve_audio_format(cli_value: str) -> str:
 
 def read_skill() -> str:
     """Return the SKILL.md text. Packaged with the wheel; falls back to the repo in dev."""
+    from importlib.resources import files
+
     packaged = files("youtube_music_dl").joinpath("SKILL.md")
     if packaged.is_file():
         return packaged.read_text(encoding="utf-8")
@@ -120,6 +136,18 @@ def build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="report what a real run would do for the URL (mode, chapters, description) without downloading",
     )
+    parser.add_argument(
+        "--plan-out",
+        default="",
+        metavar="FILE",
+        help="with --probe, also write the resolved plan (tracks, chapters, format) to FILE for a later --plan-in",
+    )
+    parser.add_argument(
+        "--plan-in",
+        default="",
+        metavar="FILE",
+        help="download what a --plan-out FILE describes, instead of the URLs, without extracting their info again",
+    )
     parser.add_argument(
         "url", nargs="*", help="URL/ID of a YouTube playlist, a video with chapters, or one or more single-song URLs"
     )
@@ -152,33 +180,152 @@ def build_parser() -> argparse.ArgumentParser:
         help=f"directory in which the album directory is created; defaults to ${OUTPUT_DIR_ENV}, else the current dir",
     )
     parser.add_argument("--force", action="store_true", help="re-download even if a track is already present")
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help=f"don't answer probes from (or save them to) the on-disk cache; see ${PROBE_CACHE_TTL_ENV}",
+    )
+    parser.add_argument(
+        "--reuse-library",
+        action="store_true",
+        help="copy tracks already in another album under the output dir instead of downloading them again",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="number of tracks to download, or chapters to split, at once (default 1, i.e. serial)",
+    )
+    parser.add_argument(
+        "--events",
+        action="store_true",
+        help="also write progress events as JSON lines as the run goes, before the final result (see --print-schema)",
+    )
+    parser.add_argument(
+        "--events-fd",
+        type=int,
+        metavar="FD",
+        help="write the --events to this open file descriptor instead of stdout, leaving stdout as usual",
+    )
     return parser
 
 
 def build_retag_parser() -> argparse.ArgumentParser:
     return argparse.ArgumentParser(
         prog="youtube-music-dl retag",
-        description="Retag an album's artist/album and move its folder to match, without re-downloading.",
+        description="Retag an album's artist/album and move its folder to match, without re-downloading. With "
+        "--library, rename an artist across all their albums at once.",
     )
 
 
 def main_retag(argv: list[str]) -> None:
     parser = build_retag_parser()
-    parser.add_argument("directory", help="existing album directory containing .opus/.mp3 files")
+    parser.add_argument("directory", nargs="?", help="existing album directory containing .opus/.m4a/.mp3 files")
     parser.add_argument("-a", "--artist", help="new artist")
     parser.add_argument("--album", help="new album")
+    parser.add_argument(
+        "--library", metavar="ROOT", help="retag every album of --from-artist under this library root, instead of one"
+    )
+    parser.add_argument("--from-artist", help="with --library: the artist (folder) whose albums to retag as --artist")
+    recovery = parser.add_mutually_exclusive_group()
+    recovery.add_argument(
+        "--resume", action="store_true", help="with --library: finish the library retag that was interrupted there"
+    )
+    recovery.add_argument(
+        "--rollback", action="store_true", help="with --library: undo the library retag that was interrupted there"
+    )
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=RETAG_JOBS, help=f"files to retag at once (default {RETAG_JOBS})"
+    )
+    parser.add_argument(
+        "-n", "--dry-run", action="store_true", help="report what would change without writing or moving anything"
+    )
     args = parser.parse_args(argv)
+    if args.library is None and (args.from_artist is not None or args.resume or args.rollback):
+        fail("INVALID_ARGS", "--from-artist, --resume and --rollback only apply with --library")
+    if args.library is not None and (args.directory is not None or args.album is not None):
+        fail("INVALID_ARGS", "--library retags every album of --from-artist; it takes no album directory or --album")
+    if args.library is None and args.directory is None:
+        fail("INVALID_ARGS", "provide an album directory, or --library")
     try:
-        result = retag(directory=args.directory, artist=args.artist, album=args.album)
+        if args.library is not None:
+            result = retag_library(
+                library=args.library,
+                from_artist=args.from_artist,
+                artist=args.artist,
+                jobs=args.jobs,
+                dry_run=args.dry_run,
+                recover="resume" if args.resume else "rollback" if args.rollback else None,
+            )
+        else:
+            assert args.directory is not None  # checked above; fail doesn't return
+            result = retag(
+                directory=args.directory, artist=args.artist, album=args.album, jobs=args.jobs, dry_run=args.dry_run
+            )
     except UserError as e:
         fail(e.code, str(e))
     except KeyboardInterrupt:
         fail("INTERRUPTED", "interrupted")
-    validate_retag(result)
+    check_output(result, RETAG_LIBRARY_SCHEMA if args.library is not None else RETAG_SCHEMA)
     emit(result)
     sys.exit(0)
 
 
+def main_batch(argv: list[str]) -> None:
+    parser = argparse.ArgumentParser(
+        prog="youtube-music-dl batch",
+        description="Download every album in a JSONL manifest in one process. Writes one result (or error) JSON object per line as each album finishes, with its `manifest_line`.",  # noqa: E501
+    )
+    parser.add_argument(
+        "manifest", help="JSONL file (or - for stdin): one object of download arguments per line, see --print-schema"
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="albums to process, and tracks to download, at once across the whole batch (default 1)",
+    )
+    args = parser.parse_args(argv)
+
+    precondition = preflight()
+    if precondition is not None:
+        fail(*precondition)
+    try:
+        manifest = sys.stdin.readlines() if args.manifest == "-" else Path(args.manifest).read_text().splitlines()
+    except OSError as e:
+        fail("INVALID_ARGS", f"couldn't read manifest {args.manifest}: {e}")
+    # the same env var defaults as a single run; a manifest line's own arguments win
+    defaults = {
+        "output_dir": resolve_output_dir(""),
+        "audio_format": resolve_audio_format(""),
+        "audio_quality": resolve_audio_quality(""),
+    }
+
+    all_ok = True
+    albums = batch(manifest, jobs=args.jobs, defaults=defaults)
+    try:
+        for obj in albums:
+            check_output(obj, ERROR_SCHEMA if "error" in obj else RESULT_SCHEMA)
+            print(json.dumps(obj, ensure_ascii=False), flush=True)
+            all_ok = all_ok and obj["ok"]
+    except UserError as e:
+        fail(e.code, str(e))
+    except KeyboardInterrupt:
+        albums.close()  # cancels the albums that haven't started
+        error = make_error("INTERRUPTED", "interrupted")
+        check_output(error, ERROR_SCHEMA)
+        print(json.dumps(error), flush=True)
+        # Albums still downloading are on worker threads that can't be interrupted, and a normal exit would wait them
+        # out. Their journals let a re-run of the manifest resume them, so exit now, after doing what exiting would.
+        close_open_journals()
+        SESSION.close()
+        sys.stderr.flush()
+        os._exit(1)
+    sys.exit(0 if all_ok else 2)
+
+
 def ytdlp_version() -> str | None:
     """
     The installed yt-dlp version, read fresh from disk in a subprocess so it's correct even right
@@ -221,7 +368,7 @@ def main_upgrade(argv: list[str]) -> None:
         "from": before,
         "to": after,
     }
-    validate_upgrade(result)
+    check_output(result, UPGRADE_SCHEMA)
     emit(result)
     sys.exit(0)
 
@@ -241,13 +388,18 @@ def preflight(need_ffmpeg: bool = True) -> tuple[ErrorCode, str] | None:
     return None
 
 
+# Set when --events share stdout: then everything on it, including the final object, must be one line.
+ndjson_stdout = False
+
+
 def emit(obj: dict[str, Any]) -> None:
-    print(json.dumps(obj, indent=2, ensure_ascii=False))  # keep accents readable (e.g. "García")
+    indent = None if ndjson_stdout else 2
+    print(json.dumps(obj, indent=indent, ensure_ascii=False), flush=True)  # keep accents readable (e.g. "García")
 
 
-def fail(code: ErrorCode, message: str) -> None:
+def fail(code: ErrorCode, message: str) -> NoReturn:
     error = make_error(code, message)
-    validate_error(error)
+    check_output(error, ERROR_SCHEMA)
     emit(error)
     sys.exit(1)
 
@@ -261,6 +413,9 @@ def main() -> None:
     if argv and argv[0] == "upgrade":
         main_upgrade(argv[1:])
         return
+    if argv and argv[0] == "batch":
+        main_batch(argv[1:])
+        return
 
     parser = build_parser()
     args = parser.parse_args()
@@ -277,14 +432,32 @@ def main() -> None:
                 "result": RESULT_SCHEMA,
                 "error": ERROR_SCHEMA,
                 "probe": PROBE_SCHEMA,
+                "plan": PLAN_SCHEMA,
                 "retag": RETAG_SCHEMA,
+                "retag_library": RETAG_LIBRARY_SCHEMA,
                 "upgrade": UPGRADE_SCHEMA,
                 "chapters_file": CHAPTERS_FILE_SCHEMA,
+                "batch_item": BATCH_ITEM_SCHEMA,
+                "event": EVENT_SCHEMA,
             }
         )
         sys.exit(0)
-    if not args.url:
+    if args.plan_in:
+        # these were all fixed when the plan was made
+        fixed = {
+            "url": args.url,
+            "--chapters-file": args.chapters_file,
+            "-p": args.playlist_items,
+            "-f": args.audio_format,
+        }
+        if given := [name for name, value in fixed.items() if value]:
+            parser.error(f"--plan-in can't be combined with {', '.join(given)}; they come from the plan")
+        if args.probe:
+            parser.error("--plan-in can't be combined with --probe")
+    elif not args.url:
         parser.error("at least one url is required")
+    if args.plan_out and not args.probe:
+        parser.error("--plan-out requires --probe")
 
     if args.probe:
         # probe only inspects (no download), so it doesn't need ffmpeg
@@ -292,43 +465,67 @@ def main() -> None:
         if precondition is not None:
             fail(*precondition)
         try:
-            info = probe_urls(args.url, chapters_file=args.chapters_file)
+            info = probe_urls(
+                args.url,
+                chapters_file=args.chapters_file,
+                cache=not args.no_cache,
+                playlist_items=args.playlist_items,
+                plan_out=args.plan_out,
+                audio_format=resolve_audio_format(args.audio_format),
+            )
         except UserError as e:
             fail(e.code, str(e))
         except KeyboardInterrupt:
             fail("INTERRUPTED", "interrupted")
-        validate_probe(info)
+        check_output(info, PROBE_SCHEMA)
         emit(info)
         sys.exit(0)
 
     if not args.artist:
         parser.error("the following argument is required: -a/--artist")
 
+    global ndjson_stdout
+    events: EventSink | None = None
+    if args.events_fd is not None:
+        try:
+            events = EventSink(os.fdopen(args.events_fd, "w", buffering=1, encoding="utf-8", closefd=False))
+        except OSError as e:
+            parser.error(f"--events-fd {args.events_fd}: {e}")
+    elif args.events:
+        events = EventSink(sys.stdout)
+        ndjson_stdout = True
+
     precondition = preflight()
     if precondition is not None:
         fail(*precondition)
 
     try:
-        result = downloader(
-            urls=args.url,
-            artist=args.artist,
-            album=args.album,
-            playlist_items=args.playlist_items,
-            strip_patterns=args.strip_patterns,
-            strip_meta=not args.no_strip_meta,
-            audio_format=resolve_audio_format(args.audio_format),
-            audio_quality=resolve_audio_quality(args.audio_quality),
-            chapters_file=args.chapters_file,
-            output_dir=resolve_output_dir(args.output_dir),
-            track_numbers=args.track_numbers,
-            force=args.force,
-        )
+        plan = load_plan(args.plan_in) if args.plan_in else None
+        with emitting(events):
+            result = downloader(
+                urls=args.url,
+                artist=args.artist,
+                album=args.album,
+                playlist_items=args.playlist_items,
+                strip_patterns=args.strip_patterns,
+                strip_meta=not args.no_strip_meta,
+                audio_format=resolve_audio_format(args.audio_format),
+                audio_quality=resolve_audio_quality(args.audio_quality),
+                chapters_file=args.chapters_file,
+                output_dir=resolve_output_dir(args.output_dir),
+                track_numbers=args.track_numbers,
+                force=args.force,
+                jobs=args.jobs,
+                reuse_library=args.reuse_library,
+                cache=not args.no_cache,
+                plan=plan,
+            )
     except UserError as e:
         fail(e.code, str(e))
     except KeyboardInterrupt:
         fail("INTERRUPTED", "interrupted")
 
-    validate_result(result)
+    check_output(result, RESULT_SCHEMA)
     emit(result)
     sys.exit(0 if result["ok"] else 2)
 
@@ -3,48 +3,94 @@ Orchestration over yt-dlp: download, split, clean, tag, and report.
 
 Design notes:
 
-- yt-dlp does the audio extraction *and* baseline metadata embedding. We control
-  its output template (`<id>.<ext>`), so the produced file path is deterministic
-  and we never glob for it.
-- We then apply a targeted tagging pass for the fields yt-dlp gets wrong or omits
-  (authoritative artist/album, cleaned title, `N/total` track number, provenance)
-  and rename to a clean `NN - Title.<ext>`.
+- yt-dlp only does the audio extraction. We control its output template
+  (`<id>.<ext>`), so the produced file path is deterministic and we never glob for
+  it.
+- We then rename to a clean `NN - Title.<ext>` and write the complete tag set in a
+  single pass: authoritative artist/album, cleaned title, `N/total` track number,
+  provenance, and the few yt-dlp fields worth keeping (see `kept_tags`).
 - Idempotency is by the `youtube_video_id` provenance tag on existing files.
 - Everything here logs to stderr; the CLI is responsible for the single stdout
   JSON object. `downloader()` returns the result dict (see `schema.RESULT_SCHEMA`).
 """
 
+import atexit
 import csv
+import functools
+import heapq
 import importlib.util
 import json
+import math
 import os
+import queue
 import re
 import shlex
 import shutil
 import subprocess
 import sys
 import tempfile
+import threading
 import time
-from collections.abc import Callable
+from collections import deque
+from collections.abc import Callable, Generator, Iterator, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
+from contextlib import contextmanager, nullcontext
 from pathlib import Path
-from typing import Any, Generic, NamedTuple, TypeVar
+from typing import Any, Generic, Literal, NamedTuple, ParamSpec, TypeVar
+
+from .cache import ProbeCache, log
+from .events import emit_event, progress_reporter
+from .journal import JournalEntry, RetagPlan, RunJournal, clear_retag_plan, load_retag_plan, save_retag_plan
+from .library import LibraryIndex, clone_file
+from .ratelimit import CircuitBreaker, RateLimiter, is_throttling, jitter
+from .schema import (
+    SCHEMA_VERSION,
+    ErrorCode,
+    make_error,
+    validate_batch_item,
+    validate_chapters_file,
+    validate_plan,
+)
+from .tagging import (
+    SUPPORTED_EXTENSIONS,
+    TagUpdate,
+    audio_length_s,
+    existing_files_by_id,
+    read_artist,
+    record_provenances,
+    tag_audio,
+    update_tags,
+)
+
 
-import jsonschema
-import yt_dlp
+def youtube_dl() -> Any:
+    """
+    The `yt_dlp` module, imported on first use rather than with this one: its extractors make it most of our import
+    time, which `--version`, `--print-schema`, `retag` and `upgrade` would otherwise pay for nothing. Untyped, since
+    yt-dlp's `extract_info`/`YoutubeDL` are effectively dynamic.
+    """
+    import yt_dlp
 
-from .schema import SCHEMA_VERSION, ErrorCode, validate_chapters_file
-from .tagging import SUPPORTED_EXTENSIONS, existing_files_by_id, read_provenance, tag_audio, update_tags
+    return yt_dlp
 
-# yt-dlp's `extract_info`/`YoutubeDL` are effectively dynamic; treat as untyped.
-youtube_dl: Any = yt_dlp
 
 Info = dict[str, Any]
 T = TypeVar("T")
+P = ParamSpec("P")
 
 # YouTube throttles bursts of requests, which surfaces as an extraction that fails and then succeeds moments later, so
-# extractions are retried before being reported as failed. One entry per retry; a video whose failure we can't classify
-# costs their sum in extra wall time. Kept short because downloads are serial, which already spaces requests out.
-RETRY_DELAYS_S = (2.0, 5.0)
+# extractions are retried before being reported as failed. One entry per retry, growing exponentially, each jittered
+# (see ratelimit.jitter) so parallel callers don't retry in lockstep; a video whose failure we can't classify costs
+# about their sum in extra wall time. Kept short because spacing requests out is RATE_LIMITER's job: it slows every
+# request in the process down when throttling shows up, so a retry doesn't have to wait out the throttling by itself.
+RETRY_BASE_DELAY_S = 2.0
+RETRY_BACKOFF = 2.5
+RETRY_DELAYS_S = tuple(RETRY_BASE_DELAY_S * RETRY_BACKOFF**attempt for attempt in range(2))
+# A playlist's (or single songs') downloads don't sleep through those delays in line, holding up every track behind
+# them: a failed track is put aside and tried again once its delay here is up (see download_slots), as many times as
+# RETRY_DELAYS_S would have. Longer, since the other tracks fill the wait, and throttling takes a while to clear.
+DEFERRED_RETRY_BASE_DELAY_S = 5.0
+DEFERRED_RETRY_DELAYS_S = tuple(DEFERRED_RETRY_BASE_DELAY_S * RETRY_BACKOFF**attempt for attempt in range(2))
 
 # Substrings (matched case-insensitively) of yt-dlp errors that no retry can fix, so we fail fast instead of backing
 # off. Deliberately conservative: an unrecognized error is treated as transient and retried, so the worst case for a
@@ -85,6 +131,26 @@ COPY_SOURCE_BY_FORMAT = {"opus": ("opus",), "m4a": ("mp4a", "aac"), "mp3": ()}
 YT_DLP_SPEC = "yt-dlp[default]"
 DISTRIBUTION_NAME = "youtube-music-dl"
 
+# yt-dlp reports durations in whole seconds, so its number and the file's can differ by about a second with neither
+# being wrong; past that, resolve_duration_s asks ffprobe to settle it.
+DURATION_AGREEMENT_S = 1.5
+
+# Files `retag` works on at once. Each is a little file I/O rather than a request to YouTube, so there's nobody to be
+# polite to: the pool is only there to overlap network storage's latency.
+RETAG_JOBS = 8
+
+# Set by `download_limit` (for `batch`): a cap on downloads in flight across every album in the process.
+_download_slots: threading.BoundedSemaphore | None = None
+
+# How far a chapter's cut may stray from the requested length before we say so. A stream-copied cut is only accurate to
+# the packet (see seek_input), so this is a few packets' worth; anything past it means the container couldn't seek
+# cleanly.
+SEEK_TOLERANCE_S = 0.1
+
+# How many idle YoutubeDL instances a YdlSession keeps around. Enough for one per worker per option set in a normal run;
+# past that (e.g. one-off option sets for chapter sources' temp dirs) the least recently used is closed.
+MAX_IDLE_YDLS = 8
+
 
 def has_pip() -> bool:
     """
@@ -174,6 +240,25 @@ class Track(NamedTuple):
     error: TrackError | None = None
 
 
+class Pending(NamedTuple):
+    """A track still to be downloaded; `info` is its full extraction when we already have one (see download_audio)."""
+
+    url: str | None
+    index: int
+    info: Info | None = None
+    tries: int = 0  # failed downloads so far (see DEFERRED_RETRY_DELAYS_S)
+    error: str | None = None  # yt-dlp's message for the last of them, for the `retrying` event
+
+
+class Downloaded(NamedTuple):
+    """A track whose audio is downloaded (as `<id>.<ext>` at `path`) but not yet renamed or tagged."""
+
+    url: str
+    index: int
+    info: Info
+    path: Path
+
+
 class Outcome(NamedTuple, Generic[T]):
     """One extraction attempt: the value, or None plus the error yt-dlp reported for it."""
 
@@ -187,6 +272,52 @@ class Chapter(NamedTuple):
     end: float
 
 
+class ChapterCut(NamedTuple):
+    """One chapter to cut out of the source video: its track number, bounds, cleaned title, and output path."""
+
+    index: int
+    chapter: Chapter
+    title: str
+    dest: Path
+
+
+WHITESPACE_RUN = re.compile(r"\s{2,}")
+
+
+class TitleCleaner:
+    """
+    Removes `patterns` from titles: each one in turn, case-insensitively, and then collapses the whitespace the
+    removals leave. Compiled once per run and kept in its Ctx, and each raw title's clean one is remembered, since a
+    run cleans a track's title more than once: when planning its tracks (skipped ones too), and again when finishing
+    each. Only within the run: every `downloader` call, each album of a batch included, builds its own.
+
+    The patterns deliberately stay separate passes, not fused into one alternation: each runs on what the ones before
+    it left, so a later pattern can match text that only became adjacent (or only reached the start of the title) once
+    an earlier one removed what was between, and one pass over the original title can't see that. Which `--strip-
+    patterns` could be fused without that changing a title depends on what they match, so it isn't ours to decide.
+    """
+
+    def __init__(self, patterns: list[str] | None = None) -> None:
+        self.patterns = list(patterns or [])
+        self._compiled = [re.compile(pattern, re.IGNORECASE) for pattern in self.patterns]
+        # raw title -> clean title; a dict's get/set is atomic, so threads may share it
+        self._clean: dict[str, str] = {}
+
+    def strip(self, s: str) -> str:
+        if not self._compiled:
+            return s
+        for pattern in self._compiled:
+            s = pattern.sub("", s)
+        return WHITESPACE_RUN.sub(" ", s).strip()
+
+    def __call__(self, raw_title: str) -> str:
+        """`raw_title` cleaned, or as it was if cleaning leaves nothing of it."""
+        clean = self._clean.get(raw_title)
+        if clean is None:
+            clean = self._clean[raw_title] = self.strip(raw_title) or raw_title
+        return clean
+
+
 class Ctx(NamedTuple):
     """Shared, per-run configuration passed to the mode handlers."""
 
@@ -196,23 +327,32 @@ class Ctx(NamedTuple):
     audio_quality: str
     artist: str
     album: str
-    patterns: list[str]
+    clean_title: TitleCleaner  # the strip patterns (--strip-patterns, plus --strip-meta's), compiled
     existing: dict[str, list[Path]]
-
-
-def log(message: str) -> None:
-    print(message, file=sys.stderr)
+    jobs: int = 1
+    # Set with `reuse_library`: the other albums under the output dir, to copy already-downloaded videos from.
+    library: LibraryIndex | None = None
+    cache: bool = True  # whether probes may be answered from the on-disk ProbeCache
+    journal: RunJournal | None = None  # where each track's progress is recorded, and an interrupted run's is read
+    breaker: CircuitBreaker | None = None  # pauses the run's requests while YouTube is throttling them
 
 
 class StderrLogger:
     """
     yt-dlp logger that keeps all of yt-dlp's chatter on stderr, and retains the last error it saw. That last error is
     the only explanation of *why* an extraction failed: yt-dlp runs with `ignoreerrors`, so it reports failure by
-    returning None and the reason survives nowhere else. One logger per extraction, so it can't pick up another's error.
+    returning None and the reason survives nowhere else. One logger per extraction, so it can't pick up another's error
+    (YdlSession swaps it in for each call on its shared YoutubeDL instances). Likewise, the call's download progress
+    goes to its `on_progress`, if any (see relay_progress).
     """
 
-    def __init__(self) -> None:
+    def __init__(self, on_progress: Callable[[dict[str, Any]], None] | None = None) -> None:
         self.last_error: str = ""
+        self.on_progress = on_progress
+
+    def progress(self, status: dict[str, Any]) -> None:
+        if self.on_progress is not None:
+            self.on_progress(status)
 
     def debug(self, msg: str) -> None:
         if not msg.startswith("[debug] "):
@@ -229,6 +369,64 @@ class StderrLogger:
         log(msg)
 
 
+class YdlSession:
+    """
+    Long-lived YoutubeDL instances, pooled by option set, so a run pays for extractor setup, HTTP connections, and the
+    player-JS cache once instead of once per extraction (and per retry).
+
+    An instance serves one call at a time: `borrow` checks one out and points its logger at the caller's StderrLogger,
+    which keeps the one-logger-per-extraction guarantee StderrLogger relies on, even with `--jobs` workers running.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._idle: list[tuple[str, Any]] = []  # (options key, YoutubeDL), least recently used first
+
+    @contextmanager
+    def borrow(self, opts: dict[str, Any], logger: StderrLogger) -> Iterator[Any]:
+        key = json.dumps(opts, sort_keys=True, default=repr)
+        ydl = None
+        with self._lock:
+            for i in range(len(self._idle) - 1, -1, -1):
+                if self._idle[i][0] == key:
+                    ydl = self._idle.pop(i)[1]
+                    break
+        if ydl is None:
+            ydl = youtube_dl().YoutubeDL({**opts, "logger": logger})
+            ydl.add_progress_hook(functools.partial(relay_progress, ydl))
+        # yt-dlp reads `params["logger"]` on every message, so swapping it redirects the whole call
+        ydl.params["logger"] = logger
+        try:
+            yield ydl
+        finally:
+            with self._lock:
+                self._idle.append((key, ydl))
+                evicted = self._idle[:-MAX_IDLE_YDLS]
+                del self._idle[:-MAX_IDLE_YDLS]
+            for _, old in evicted:
+                old.close()
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for _, ydl in idle:
+            ydl.close()
+
+
+def relay_progress(ydl: Any, status: dict[str, Any]) -> None:
+    """A pooled YoutubeDL's one progress hook: hand the status to whichever call's logger currently has it."""
+    ydl.params["logger"].progress(status)
+
+
+# One session for the whole process, so everything a run (or a batch of runs) extracts shares it.
+SESSION = YdlSession()
+atexit.register(SESSION.close)
+# Likewise one rate limiter, since YouTube throttles the IP, not a run (see ratelimit.py)
+RATE_LIMITER = RateLimiter.from_env()
+# And one probe cache, so that its eviction lock is shared by every thread probing, and its settings read once
+PROBE_CACHE = ProbeCache.from_env()
+
+
 def js_runtimes_opt() -> dict[str, dict[str, Any]] | None:
     """Return the yt-dlp `js_runtimes` param, or None to accept the default (deno).
 
@@ -243,7 +441,8 @@ def js_runtimes_opt() -> dict[str, dict[str, Any]] | None:
 
 
 def base_opts() -> dict[str, Any]:
-    # No "logger" here: each extraction injects its own StderrLogger so it can read back that call's error.
+    # No "logger" here: each extraction injects its own StderrLogger (see YdlSession) so it can read back that call's
+    # error.
     opts: dict[str, Any] = {
         "ignoreerrors": True,
         "quiet": True,
@@ -278,10 +477,28 @@ def download_opts(target_dir: Path, audio_format: str, audio_quality: str) -> di
     # audio only: no need to fetch (and re-mux) video, and it lets the native stream be copied
     opts["format"] = FORMAT_SELECTION[audio_format]
     opts["outtmpl"] = str(target_dir / "%(id)s.%(ext)s")
-    opts["postprocessors"] = [postprocessor, {"key": "FFmpegMetadata"}]
+    opts["continuedl"] = True  # pick up a `.part` file an interrupted run left behind (see journal.py)
+    # No FFmpegMetadata: it rewrites the whole file through ffmpeg just to embed tags that tag_audio then mostly
+    # overwrites. tag_audio writes what's worth keeping of them instead, in its one save (see kept_tags).
+    opts["postprocessors"] = [postprocessor]
     return opts
 
 
+def kept_tags(info: Info) -> dict[str, str]:
+    """
+    The tags yt-dlp's FFmpegMetadata would have embedded that are worth keeping, as tag_audio arguments: the upload
+    date (as `YYYY-MM-DD`, the form ID3 requires) and the video's URL as the comment. The rest we either write ourselves
+    (title, artist, album, track number) or don't want in a music library (the description, the channel's video tags).
+    """
+    tags = {}
+    upload_date = info.get("upload_date") or ""
+    if re.fullmatch(r"\d{8}", upload_date):
+        tags["date"] = f"{upload_date[:4]}-{upload_date[4:6]}-{upload_date[6:]}"
+    if info.get("webpage_url"):
+        tags["comment"] = info["webpage_url"]
+    return tags
+
+
 def is_permanent_failure(error: str) -> bool:
     """Whether yt-dlp's error says the video can never be fetched (vs. throttling, which a retry can clear)."""
     normalized = error.lower()
@@ -303,20 +520,42 @@ def track_json(track: Track) -> dict[str, Any]:
     return data
 
 
-def with_retries(fn: Callable[[], Outcome[T]], description: str) -> Outcome[T]:
+def with_retries(
+    fn: Callable[[], Outcome[T]],
+    description: str,
+    breaker: CircuitBreaker | None = None,
+    delays_s: tuple[float, ...] | None = None,
+) -> Outcome[T]:
     """
-    Call `fn` until it succeeds, pausing RETRY_DELAYS_S between tries. Returns early on a failure yt-dlp has told
-    us is permanent, so a private or deleted video is reported immediately instead of after the full backoff.
+    Call `fn` until it succeeds, pausing `delays_s` (default RETRY_DELAYS_S; jittered) between tries. Returns early on a
+    failure yt-dlp has told us is permanent, so a private or deleted video is reported immediately instead of after the
+    full backoff. Each try first waits out the run's `breaker`, if it's open, and then tells it how the try went.
     """
-    for delay_s in RETRY_DELAYS_S:
-        outcome = fn()
+
+    def attempt() -> Outcome[T]:
+        if breaker is None:
+            return fn()
+        canary = breaker.wait()
+        try:
+            outcome = fn()
+        except BaseException:
+            # Says nothing about throttling, but a canary that never reports back would hold every other request
+            breaker.record(False, True, canary)
+            raise
+        breaker.record(outcome.value is not None, is_permanent_failure(outcome.error), canary)
+        return outcome
+
+    for delay_s in RETRY_DELAYS_S if delays_s is None else delays_s:
+        outcome = attempt()
         if outcome.value is not None:
             return outcome
         if is_permanent_failure(outcome.error):
             return outcome
-        log(f"{description} failed, retrying in {delay_s:g}s")
+        delay_s = jitter(delay_s)
+        log(f"{description} failed, retrying in {delay_s:.1f}s")
+        emit_event("retrying", what=description, delay_s=delay_s, error=outcome.error or None)
         time.sleep(delay_s)
-    return fn()
+    return attempt()
 
 
 def extraction_failed_message(prefix: str, error: str) -> str:
@@ -331,32 +570,91 @@ def extraction_failed_message(prefix: str, error: str) -> str:
     return f"{prefix}{detail}. {outdated_ytdlp_hint()}"
 
 
-def probe(url: str, opts: dict[str, Any]) -> Outcome[Info]:
-    return with_retries(lambda: probe_once(url, opts), f"extracting info for {url}")
+def probe(url: str, opts: dict[str, Any], cache: bool = True, breaker: CircuitBreaker | None = None) -> Outcome[Info]:
+    """Extract `url`'s info without downloading, answering from the on-disk ProbeCache when it can (unless `cache`)."""
+    store = PROBE_CACHE if cache else None
+    if store is not None:
+        cached = store.get(url, opts)
+        log(f"probe cache {'hit' if cached is not None else 'miss'} for {url}")
+        if cached is not None:
+            return Outcome(cached)
+    outcome = with_retries(lambda: probe_once(url, opts), f"extracting info for {url}", breaker)
+    if store is not None and outcome.value:
+        store.put(url, opts, youtube_dl().YoutubeDL.sanitize_info(outcome.value))
+    return outcome
 
 
+def paced(request: Callable[P, Outcome[T]]) -> Callable[P, Outcome[T]]:
+    """Route `request` through RATE_LIMITER: it waits its turn, and reports whether YouTube throttled it."""
+
+    @functools.wraps(request)
+    def wrapper(*args: P.args, **kwargs: P.kwargs) -> Outcome[T]:
+        RATE_LIMITER.acquire()
+        outcome = request(*args, **kwargs)
+        if outcome.value is not None:
+            RATE_LIMITER.succeeded()
+        elif is_throttling(outcome.error):
+            log("YouTube is throttling requests; slowing down")
+            RATE_LIMITER.throttled()
+        return outcome
+
+    return wrapper
+
+
+@paced
 def probe_once(url: str, opts: dict[str, Any]) -> Outcome[Info]:
     logger = StderrLogger()
-    with youtube_dl.YoutubeDL({**opts, "logger": logger}) as ydl:
+    with SESSION.borrow(opts, logger) as ydl:
         return Outcome(ydl.extract_info(url, download=False), logger.last_error)
 
 
 def download_audio(
-    url: str, target_dir: Path, audio_format: str, audio_quality: str, ext: str
+    url: str,
+    target_dir: Path,
+    audio_format: str,
+    audio_quality: str,
+    ext: str,
+    info: Info | None = None,
+    on_progress: Callable[[dict[str, Any]], None] | None = None,
+    breaker: CircuitBreaker | None = None,
+    retry_delays_s: tuple[float, ...] | None = None,
 ) -> Outcome[tuple[Info, Path]]:
+    """
+    Download `url` with retries (see with_retries; `()` for a single try). Pass the video's already-extracted `info` to
+    spend the first attempt downloading from it instead of extracting the video all over again; retries extract afresh,
+    in case the failure was a stale format URL in `info`.
+    """
+    reusable = [info] if info and info.get("formats") else []
     return with_retries(
-        lambda: download_audio_once(url, target_dir, audio_format, audio_quality, ext), f"downloading {url}"
+        lambda: download_audio_once(
+            url, target_dir, audio_format, audio_quality, ext, reusable.pop() if reusable else None, on_progress
+        ),
+        f"downloading {url}",
+        breaker,
+        retry_delays_s,
     )
 
 
+@paced
 def download_audio_once(
-    url: str, target_dir: Path, audio_format: str, audio_quality: str, ext: str
+    url: str,
+    target_dir: Path,
+    audio_format: str,
+    audio_quality: str,
+    ext: str,
+    info: Info | None = None,
+    on_progress: Callable[[dict[str, Any]], None] | None = None,
 ) -> Outcome[tuple[Info, Path]]:
     """Download one video's audio into target_dir. Returns (info, final_path), or None plus yt-dlp's error."""
-    logger = StderrLogger()
-    opts = {**download_opts(target_dir, audio_format, audio_quality), "logger": logger}
-    with youtube_dl.YoutubeDL(opts) as ydl:
-        info = ydl.extract_info(url, download=True)
+    logger = StderrLogger(on_progress)
+    with (
+        _download_slots or nullcontext(),
+        SESSION.borrow(download_opts(target_dir, audio_format, audio_quality), logger) as ydl,
+    ):
+        if info is None:
+            info = ydl.extract_info(url, download=True)
+        else:
+            info = process_extracted(ydl, info, logger)
     if not info:
         return Outcome(None, logger.last_error)
     video_id = info.get("id")
@@ -369,6 +667,21 @@ def download_audio_once(
     return Outcome((info, path), logger.last_error)
 
 
+def process_extracted(ydl: Any, info: Info, logger: StderrLogger) -> Info | None:
+    """
+    Download from an info dict extracted earlier (by `probe`) rather than from its URL, the way yt-dlp's own
+    `--load-info-json` does. Private keys are dropped so format selection reruns under the download opts.
+    `process_ie_result` isn't wrapped in yt-dlp's `ignoreerrors` handling the way `extract_info` is, so its errors are
+    reported through the logger here instead.
+    """
+    utils = youtube_dl().utils
+    try:
+        return ydl.process_ie_result(ydl.sanitize_info(info, remove_private_keys=True), download=True)
+    except (utils.DownloadError, utils.ExtractorError) as e:
+        logger.error(str(e))
+        return None
+
+
 def warn_if_transcoded(info: Info, audio_format: str, video_id: str) -> None:
     """
     Log a stderr note when the requested format's native stream was missing and we had to re-encode. `info["acodec"]` is
@@ -383,12 +696,16 @@ def warn_if_transcoded(info: Info, audio_format: str, video_id: str) -> None:
 
 def finalize(src: Path, directory: Path, index: int, title: str, ext: str) -> Path:
     """Rename a downloaded `<id>.<ext>` file to a clean `NN - Title.<ext>`."""
-    dest = directory / f"{index:02d} - {clean_filename(title)}{ext}"
+    dest = final_path(directory, index, title, ext)
     if src != dest:
         src.replace(dest)
     return dest
 
 
+def final_path(directory: Path, index: int, title: str, ext: str) -> Path:
+    return directory / f"{index:02d} - {clean_filename(title)}{ext}"
+
+
 def video_url(video_id: str) -> str:
     return f"https://www.youtube.com/watch?v={video_id}"
 
@@ -415,13 +732,27 @@ def probe_hint(mode: str, has_chapters_file: bool) -> str:
     return "This is a playlist; each entry becomes a track."
 
 
-def probe_urls(urls: list[str], chapters_file: str = "") -> dict[str, Any]:
-    """Report what a real run would do for a URL, without downloading (the `--probe` mode)."""
-    top, error = probe(urls[0], probe_opts())
+def probe_urls(
+    urls: list[str],
+    chapters_file: str = "",
+    cache: bool = True,
+    playlist_items: str = "",
+    plan_out: str = "",
+    audio_format: str = DEFAULT_AUDIO_FORMAT,
+) -> dict[str, Any]:
+    """
+    Report what a real run would do for a URL, without downloading (the `--probe` mode). With `plan_out`, also write
+    that run's plan there (see `make_plan`), for a later `downloader(plan=...)` to execute without probing again.
+    """
+    if plan_out:
+        chapters_file = resolve_chapters_file(chapters_file)
+    top, error = probe(urls[0], probe_opts(playlist_items), cache)
     if not top:
         raise UserError("NO_INFO", extraction_failed_message(f"couldn't extract info for {urls[0]}", error))
 
     mode = detect_mode(top, has_chapters_file=bool(chapters_file))
+    if plan_out:
+        write_plan(make_plan(urls, top, mode, chapters_file, audio_format, cache), plan_out)
     entries: list[dict[str, Any]] = []
     if mode == "playlist":
         for i, entry in enumerate(top.get("entries") or [], start=1):
@@ -444,6 +775,157 @@ def probe_urls(urls: list[str], chapters_file: str = "") -> dict[str, Any]:
     }
 
 
+def make_plan(
+    urls: list[str], top: Info, mode: str, chapters_file: str, audio_format: str, cache: bool = True
+) -> dict[str, Any]:
+    """
+    Resolve everything a run of `urls` would decide before downloading, as a PLAN_SCHEMA object. `top` is urls[0]'s
+    probe; in single-songs mode the other URLs are probed here too, so the run has every video id up front.
+    """
+    if audio_format not in AUDIO_FORMATS:
+        raise UserError("INVALID_ARGS", f"invalid audio format {audio_format!r}; must be one of {AUDIO_FORMATS}")
+    chapters: list[dict[str, Any]] = []
+    if mode == "playlist":
+        entries = [plan_entry(i, entry, None) for i, entry in enumerate(top.get("entries") or [], start=1)]
+    elif mode == "single_songs":
+        infos = [top] + [probe(url, probe_opts(), cache).value for url in urls[1:]]
+        entries = [plan_entry(i, info, url) for i, (url, info) in enumerate(zip(urls, infos), start=1)]
+    else:
+        entries = [plan_entry(1, top, urls[0])]
+        raw_chapters = parse_chapters_file(chapters_file) if chapters_file else top.get("chapters") or []
+        chapters = [
+            {"title": c.get("title"), "start_time": c.get("start_time"), "end_time": c.get("end_time")}
+            for c in raw_chapters
+        ]
+    return {
+        "version": SCHEMA_VERSION,
+        "kind": "plan",
+        "mode": mode,
+        "urls": urls,
+        "title": top.get("title"),
+        "format": audio_format,
+        "format_selection": FORMAT_SELECTION[audio_format],
+        "duration_s": top.get("duration") if mode != "playlist" else None,
+        "chapters": chapters,
+        "entries": entries,
+    }
+
+
+def plan_entry(index: int, info: Info | None, url: str | None) -> dict[str, Any]:
+    video_id = info.get("id") if info else None
+    title = (info.get("title") if info else None) or ""
+    return {
+        "index": index,
+        "youtube_video_id": video_id,
+        "title": title,
+        "url": video_url(video_id) if video_id else url,
+    }
+
+
+def write_plan(plan: dict[str, Any], path: str) -> None:
+    validate_plan(plan)
+    dest = Path(os.path.expanduser(path))
+    try:
+        dest.write_text(json.dumps(plan, indent=2, ensure_ascii=False) + "\n")
+    except OSError as e:
+        raise UserError("INVALID_ARGS", f"couldn't write plan to {dest}: {e}") from None
+    log(f"plan written to {dest}")
+
+
+def load_plan(path: str) -> dict[str, Any]:
+    """Read and validate a plan written by `--probe --plan-out`."""
+    import jsonschema  # only when there's something to validate; see schema.validate
+
+    try:
+        plan = json.loads(Path(os.path.expanduser(path)).read_text())
+    except OSError as e:
+        raise UserError("INVALID_ARGS", f"couldn't read plan {path}: {e}") from None
+    except json.JSONDecodeError as e:
+        raise UserError("INVALID_ARGS", f"plan {path} isn't JSON: {e}") from None
+    try:
+        validate_plan(plan)
+    except jsonschema.ValidationError as e:
+        raise UserError("INVALID_ARGS", f"invalid plan {path}: {e.message}") from None
+    return plan
+
+
+def plan_top(plan: dict[str, Any]) -> Info:
+    """Stand in for the top-level extraction a plan replaces, with just the fields `do_*` read from it."""
+    entries = [
+        {"id": e["youtube_video_id"], "title": e["title"]} if e["youtube_video_id"] else None for e in plan["entries"]
+    ]
+    if plan["mode"] == "playlist":
+        return {"title": plan["title"], "entries": entries}
+    return {**(entries[0] or {}), "duration": plan["duration_s"], "chapters": plan["chapters"], "entries": entries}
+
+
+def resolve_chapters_file(chapters_file: str) -> str:
+    """The chapters file's absolute path ("" for none); raises NO_CHAPTERS_FILE if it doesn't exist."""
+    if not chapters_file:
+        return ""
+    chapters_file = os.path.abspath(os.path.expanduser(chapters_file))
+    if not os.path.exists(chapters_file):
+        raise UserError("NO_CHAPTERS_FILE", f"no chapters file at {chapters_file}")
+    return chapters_file
+
+
+@contextmanager
+def download_limit(limit: int) -> Iterator[None]:
+    """Allow at most `limit` downloads in flight at once, across every album this process is downloading."""
+    global _download_slots
+    previous, _download_slots = _download_slots, threading.BoundedSemaphore(limit)
+    try:
+        yield
+    finally:
+        _download_slots = previous
+
+
+def batch(
+    manifest: list[str], jobs: int = 1, defaults: dict[str, Any] | None = None
+) -> Generator[dict[str, Any], None, None]:
+    """
+    Download every album in a JSONL `manifest` (one object of `downloader` arguments per line, over `defaults`) in this
+    process, so they share its yt-dlp instances and caches. Yields each album's result, or error object, as it finishes,
+    tagged with its `manifest_line`. Up to `jobs` albums run at once, and at most `jobs` downloads are in flight across
+    all of them whatever each album's own `jobs`. A failing album is reported, and the others carry on.
+    """
+    if jobs < 1:
+        raise UserError("INVALID_ARGS", f"invalid jobs {jobs!r}; must be at least 1")
+    lines = [(number, line) for number, line in enumerate(manifest, start=1) if line.strip()]
+    with download_limit(jobs):
+        pool = ThreadPoolExecutor(max_workers=jobs, thread_name_prefix="ymd-album")
+        try:
+            futures = {pool.submit(run_manifest_line, line, defaults or {}): number for number, line in lines}
+            for future in as_completed(futures):
+                yield {**future.result(), "manifest_line": futures[future]}
+        except BaseException:
+            # Ctrl-C, or the caller closing the generator: start no more albums, and don't wait on the running ones
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+        pool.shutdown()
+
+
+def run_manifest_line(line: str, defaults: dict[str, Any]) -> dict[str, Any]:
+    """One album of a `batch`: its result, or an error object; never raises (except on Ctrl-C)."""
+    import jsonschema
+
+    try:
+        kwargs = json.loads(line)
+        validate_batch_item(kwargs)
+    except json.JSONDecodeError as e:
+        return make_error("INVALID_ARGS", f"manifest line isn't JSON: {e}")
+    except jsonschema.ValidationError as e:
+        return make_error("INVALID_ARGS", f"invalid manifest line: {e.message}")
+    opts: dict[str, Any] = {**defaults, **kwargs}
+    try:
+        return downloader(urls=opts.pop("urls", []), **opts)
+    except UserError as e:
+        return make_error(e.code, str(e))
+    except Exception as e:
+        log(f"unexpected error downloading {kwargs.get('urls') or 'a plan'}: {e!r}")
+        return make_error("INTERNAL_ERROR", f"{type(e).__name__}: {e}")
+
+
 def downloader(
     urls: list[str],
     artist: str = "",
@@ -457,24 +939,36 @@ def downloader(
     output_dir: str = "",
     track_numbers: str = "",
     force: bool = False,
+    jobs: int = 1,
+    reuse_library: bool = False,
+    cache: bool = True,
+    plan: dict[str, Any] | None = None,
 ) -> dict[str, Any]:
+    """
+    Download `urls` as one album. A `plan` (see `load_plan`) replaces `urls`, `audio_format`, `playlist_items` and
+    `chapters_file` with the ones it was made with, and stands in for the top-level extraction.
+    """
+    if plan is not None:
+        urls, audio_format, playlist_items, chapters_file = plan["urls"], plan["format"], "", ""
     if audio_format not in AUDIO_FORMATS:
         raise UserError("INVALID_ARGS", f"invalid audio format {audio_format!r}; must be one of {AUDIO_FORMATS}")
+    if jobs < 1:
+        raise UserError("INVALID_ARGS", f"invalid jobs {jobs!r}; must be at least 1")
     ext = EXT_BY_FORMAT[audio_format]
     audio_quality = normalize_audio_quality(audio_quality)
 
-    if chapters_file:
-        chapters_file = os.path.abspath(os.path.expanduser(chapters_file))
-        if not os.path.exists(chapters_file):
-            raise UserError("NO_CHAPTERS_FILE", f"no chapters file at {chapters_file}")
+    chapters_file = resolve_chapters_file(chapters_file)
 
     base_dir = Path(os.path.expanduser(output_dir)).resolve() if output_dir else Path.cwd()
 
-    top, error = probe(urls[0], probe_opts(playlist_items))
-    if not top:
-        raise UserError("NO_INFO", extraction_failed_message(f"couldn't extract info for {urls[0]}", error))
-
-    mode = detect_mode(top, has_chapters_file=bool(chapters_file))
+    breaker = CircuitBreaker()
+    if plan is not None:
+        top, mode = plan_top(plan), plan["mode"]
+    else:
+        top, error = probe(urls[0], probe_opts(playlist_items), cache, breaker)
+        if not top:
+            raise UserError("NO_INFO", extraction_failed_message(f"couldn't extract info for {urls[0]}", error))
+        mode = detect_mode(top, has_chapters_file=bool(chapters_file))
 
     if mode == "single_songs" and not album:
         raise UserError("ALBUM_REQUIRED", "single-song URL(s) require an album name (--album)")
@@ -489,6 +983,7 @@ def downloader(
     if strip_meta:
         patterns.extend(get_strip_meta_patterns(artist, album))
 
+    journal = RunJournal(directory, resume=not force)
     ctx = Ctx(
         directory=directory,
         ext=ext,
@@ -496,17 +991,28 @@ def downloader(
         audio_quality=audio_quality,
         artist=artist,
         album=album,
-        patterns=patterns,
+        clean_title=TitleCleaner(patterns),
         existing={} if force else existing_files_by_id(directory),
+        jobs=jobs,
+        library=LibraryIndex.load(base_dir) if reuse_library and not force else None,
+        cache=cache,
+        journal=journal,
+        breaker=breaker,
     )
 
     chapters_file_used: str | None = None
-    if mode == "playlist":
-        tracks = do_playlist(top, ctx, track_numbers)
-    elif mode == "single_songs":
-        tracks = do_single_songs(urls, ctx, track_numbers)
-    else:
-        tracks, chapters_file_used = do_chapters(urls[0], top, chapters_file, ctx)
+    try:
+        if mode == "playlist":
+            tracks = do_playlist(top, ctx, track_numbers)
+        elif mode == "single_songs":
+            infos = plan_top(plan)["entries"] if plan is not None else [top] + [None] * (len(urls) - 1)
+            tracks = do_single_songs(urls, infos, ctx, track_numbers)
+        else:
+            tracks, chapters_file_used = do_chapters(urls[0], top, chapters_file, ctx)
+    except BaseException:
+        journal.close(completed=False)  # interrupted or crashed: keep it, so the next run resumes
+        raise
+    journal.close(completed=True)
 
     failed = [t for t in tracks if t.status == "failed"]
     if failed:
@@ -526,6 +1032,7 @@ def downloader(
         "format": audio_format,
         "chapters_file": chapters_file_used,
         "tracks": [track_json(t) for t in tracks],
+        "throttle_pause_s": round(breaker.paused_s, 1),
     }
 
 
@@ -538,60 +1045,289 @@ def do_playlist(top: Info, ctx: Ctx, track_numbers: str) -> list[Track]:
         )
 
     total = len(entries)
-    results: list[Track] = []
+    # Each slot is either a finished Track, a Pending download, or (resuming an interrupted run) a Downloaded track to
+    # finish, so the downloads can run on a pool and still land back in playlist order.
+    slots: list[Track | Pending | Downloaded] = []
     for i, entry in enumerate(entries):
         index = tracks_nums[i] if tracks_nums else i + 1
         if entry is None:
             # yt-dlp couldn't even list this entry, so there's no message to report and no way to tell whether a
             # re-run would help; the conservative default (not permanent) says "worth retrying".
-            results.append(Track(index, "failed", "", None, None, None, track_error("")))
+            slots.append(Track(index, "failed", "", None, None, None, track_error("")))
             continue
         video_id = entry.get("id")
         url = video_url(video_id) if video_id else None
         raw_title = entry.get("title") or (video_id or "")
+        if (resumed := resume_track(url, index, total, ctx)) is not None:
+            slots.append(resumed)
+            continue
         if video_id and video_id in ctx.existing:
-            title = strip(raw_title, ctx.patterns) or raw_title
-            results.append(Track(index, "skipped", title, video_id, url, str(ctx.existing[video_id][0])))
+            title = ctx.clean_title(raw_title)
+            slots.append(Track(index, "skipped", title, video_id, url, str(ctx.existing[video_id][0])))
             continue
-        results.append(download_and_tag(url, index, total, ctx))
-    return results
+        if video_id and (reused := reuse_from_library(video_id, raw_title, index, total, ctx)):
+            slots.append(reused)
+            continue
+        slots.append(Pending(url, index))  # flat playlist entries carry no formats to download from
+    return download_slots(slots, total, ctx)
+
+
+def resume_track(url: str | None, index: int, total: int, ctx: Ctx) -> Track | Downloaded | None:
+    """
+    Pick track `index` up from where an interrupted run journaled it: a `tagged` track is reported as that run would
+    have, a `finalized` one only needs its tags, and a `downloaded` one is handed back to be finished. None means the
+    track still has to be downloaded (an earlier state, or its file is gone).
+    """
+    prior = ctx.journal.resumed(index, url) if ctx.journal else None
+    if prior is None or prior.file is None or not Path(prior.file).is_file():
+        return None
+    video_id, title, path = prior.youtube_video_id, prior.title, Path(prior.file)
+    if prior.state == "tagged":
+        return Track(index, "downloaded", title, video_id, video_url(video_id) if video_id else url, str(path))
+    if prior.state == "finalized" and url:
+        return tag_track(path, title, index, total, video_id, url, ctx)
+    if prior.state == "downloaded" and url:
+        return Downloaded(url, index, {"id": video_id, "title": title}, path)
+    return None
+
 
+def record_state(
+    ctx: Ctx,
+    index: int,
+    state: str,
+    url: str | None,
+    video_id: str | None = None,
+    title: str = "",
+    file: Path | None = None,
+) -> None:
+    if ctx.journal is not None:
+        ctx.journal.record(JournalEntry(index, state, url, video_id, title, str(file) if file else None))
 
-def do_single_songs(urls: list[str], ctx: Ctx, track_numbers: str) -> list[Track]:
+
+def reuse_from_library(video_id: str, raw_title: str, index: int, total: int, ctx: Ctx) -> Track | None:
+    """
+    If another album in the library already has `video_id` in this format, copy it in and finish it (rename and
+    retag for this album) like a fresh download, and return its Track; otherwise None. Reusing is only a shortcut, so
+    when it fails (the library is on another device, the disk is full, the file is gone since it was indexed) the
+    partial copy is removed and None returned, for the track to be downloaded as usual.
+    """
+    src = ctx.library.reusable_file(video_id, ctx.ext, ctx.directory) if ctx.library else None
+    if src is None:
+        return None
+    log(f"reusing {video_id} from {src} instead of downloading it")
+    dest = ctx.directory / f"{video_id}{ctx.ext}"
+    try:
+        clone_file(src, dest)
+    except OSError as e:
+        log(f"couldn't copy {src} ({e}); downloading {video_id} instead")
+        dest.unlink(missing_ok=True)
+        return None
+    downloaded = Downloaded(video_url(video_id), index, {"id": video_id, "title": raw_title}, dest)
+    try:
+        return finish_track(downloaded, total, ctx)
+    except Exception as e:
+        log(f"couldn't finish {video_id} copied from {src} ({e}); downloading it instead")
+        if dest.exists():  # failed before the rename
+            dest.unlink()
+        else:
+            final_path(ctx.directory, index, ctx.clean_title(raw_title), ctx.ext).unlink(missing_ok=True)
+        return None
+
+
+def download_slots(slots: list[Track | Pending | Downloaded], total: int, ctx: Ctx) -> list[Track]:
+    """
+    Resolve each Pending slot, keeping slot order, as a two-stage pipeline: up to `ctx.jobs` threads run `fetch_track`
+    (network-bound) and hand off to one thread running `finish_track` (rename and tag, disk-bound), so local
+    post-processing hides behind the next download. The hand-off queue holds at most `ctx.jobs` downloaded tracks;
+    when finishing falls behind, downloaders wait rather than piling up finished files. Downloaded slots (left by an
+    interrupted run) skip straight to the second stage. A download that fails for what may be throttling is tried
+    again later rather than in line (see schedule_fetches), so the tracks behind it keep flowing.
+
+    Threads rather than processes because the work is waiting on the network, ffmpeg subprocesses, and the disk. Every
+    download still gets its own StderrLogger (see download_audio_once), so a failure is attributed to its own track.
+    """
+    pending = [slot for slot in slots if not isinstance(slot, Track)]
+    for slot in slots:
+        if isinstance(slot, Track):
+            track_done(slot)  # skipped, reused, or already failed: known before anything downloads
+        elif isinstance(slot, Pending):
+            record_state(ctx, slot.index, "queued", slot.url)
+    finished: dict[int, Track] = {}  # by position in `pending`
+    handoff: queue.Queue[tuple[int, Track | Downloaded] | None] = queue.Queue(maxsize=ctx.jobs)
+    errors: list[BaseException] = []
+
+    def finish_all() -> None:
+        while (item := handoff.get()) is not None:
+            position, fetched = item
+            if errors:
+                continue  # keep draining so no downloader blocks on a full queue; the error is raised below
+            try:
+                finished[position] = track_done(
+                    fetched if isinstance(fetched, Track) else finish_track(fetched, total, ctx)
+                )
+            except BaseException as e:
+                errors.append(e)
+
+    def fetch(position: int, slot: Pending | Downloaded) -> Pending | None:
+        fetched = slot if isinstance(slot, Downloaded) else fetch_track(slot, ctx)
+        if isinstance(slot, Pending) and isinstance(fetched, Track) and retryable(slot, fetched):
+            # extract afresh, in case `info` went stale
+            return slot._replace(
+                info=None, tries=slot.tries + 1, error=fetched.error.message if fetched.error else None
+            )
+        handoff.put((position, fetched))
+        return None
+
+    finisher = threading.Thread(target=finish_all, name="ymd-finish")
+    finisher.start()
+    try:
+        schedule_fetches(pending, fetch, ctx.jobs)
+    finally:
+        handoff.put(None)
+        finisher.join()
+    if errors:
+        raise errors[0]
+    done = iter(finished[position] for position in range(len(pending)))
+    return [slot if isinstance(slot, Track) else next(done) for slot in slots]
+
+
+def retryable(pending: Pending, failed: Track) -> bool:
+    """Whether `pending`'s download, which just `failed`, is worth another try later."""
+    return (
+        pending.url is not None
+        and pending.tries < len(DEFERRED_RETRY_DELAYS_S)
+        and not (failed.error and failed.error.permanent)
+    )
+
+
+def schedule_fetches(
+    slots: list[Pending | Downloaded], fetch: Callable[[int, Pending | Downloaded], Pending | None], jobs: int
+) -> None:
+    """
+    Run `fetch` on each of `slots` (with its position), on up to `jobs` threads. When `fetch` hands back a slot to
+    retry, it's fetched again once its DEFERRED_RETRY_DELAYS_S delay (jittered) is up: after every other slot has had
+    its first try when serial, and as soon as a thread is free when parallel. Waiting for a retry to come due is the
+    only time this sleeps, and only when there's nothing else left to do.
+    """
+    ready = deque(enumerate(slots))
+    deferred: list[tuple[float, int, Pending]] = []  # a heap of (due time, position, retry)
+    with ThreadPoolExecutor(max_workers=max(1, min(jobs, len(slots)))) as pool:
+        in_flight: dict[Future[Pending | None], int] = {}
+        while ready or deferred or in_flight:
+            now_s = time.monotonic()
+            while len(in_flight) < jobs:
+                if deferred and deferred[0][0] <= now_s and (jobs > 1 or not ready):
+                    _, position, slot = heapq.heappop(deferred)
+                elif ready:
+                    position, slot = ready.popleft()
+                else:
+                    break
+                in_flight[pool.submit(fetch, position, slot)] = position
+            # A retry coming due only matters with a thread free to start it; until then, wait for one to finish
+            until_due_s = max(0.0, deferred[0][0] - now_s) if deferred and len(in_flight) < jobs else None
+            if not in_flight:
+                time.sleep(until_due_s or 0.0)
+                continue
+            done, _ = wait(in_flight, timeout=until_due_s, return_when=FIRST_COMPLETED)
+            for future in done:
+                position = in_flight.pop(future)
+                if (retry := future.result()) is None:  # result() surfaces a downloader's exception
+                    continue
+                delay_s = jitter(DEFERRED_RETRY_DELAYS_S[retry.tries - 1])
+                log(f"downloading {retry.url} failed, retrying in {delay_s:.1f}s, after other tracks")
+                emit_event("retrying", what=f"downloading {retry.url}", delay_s=delay_s, error=retry.error)
+                heapq.heappush(deferred, (time.monotonic() + delay_s, position, retry))
+
+
+def track_done(track: Track) -> Track:
+    """Report a track's final state as a `track_done` event, as soon as it's known."""
+    emit_event("track_done", **track_json(track))
+    return track
+
+
+def do_single_songs(urls: list[str], infos: list[Info | None], ctx: Ctx, track_numbers: str) -> list[Track]:
+    """
+    `infos` holds what's already known about each URL: the first one's extraction, done by `downloader` to detect the
+    mode, or a plan's entries. A URL with None is probed here.
+    """
     tracks_nums = parse_track_numbers(track_numbers)
     if tracks_nums and len(urls) != len(tracks_nums):
         raise UserError("INVALID_ARGS", f"you passed {len(tracks_nums)} track number(s) and {len(urls)} url(s)")
 
     total = len(urls)
-    results: list[Track] = []
+    slots: list[Track | Pending | Downloaded] = []
     for i, url in enumerate(urls):
         index = tracks_nums[i] if tracks_nums else i + 1
-        info, error = probe(url, probe_opts())
+        if (resumed := resume_track(url, index, total, ctx)) is not None:
+            slots.append(resumed)  # an interrupted run already got this far, so there's no need to probe it again
+            continue
+        info, error = (infos[i], "") if infos[i] is not None else probe(url, probe_opts(), ctx.cache, ctx.breaker)
         if not info:
-            results.append(Track(index, "failed", "", None, url, None, track_error(error)))
+            slots.append(Track(index, "failed", "", None, url, None, track_error(error)))
             continue
         video_id = info.get("id")
         raw_title = info.get("title") or (video_id or "")
         if video_id and video_id in ctx.existing:
-            title = strip(raw_title, ctx.patterns) or raw_title
+            title = ctx.clean_title(raw_title)
             canonical = video_url(video_id)
-            results.append(Track(index, "skipped", title, video_id, canonical, str(ctx.existing[video_id][0])))
+            slots.append(Track(index, "skipped", title, video_id, canonical, str(ctx.existing[video_id][0])))
             continue
-        results.append(download_and_tag(url, index, total, ctx))
-    return results
+        if video_id and (reused := reuse_from_library(video_id, raw_title, index, total, ctx)):
+            slots.append(reused)
+            continue
+        slots.append(Pending(url, index, info))  # download from the probe rather than extracting the video twice
+    return download_slots(slots, total, ctx)
 
 
-def download_and_tag(url: str | None, index: int, total: int, ctx: Ctx) -> Track:
-    if not url:
-        return Track(index, "failed", "", None, None, None, track_error(""))
-    downloaded, error = download_audio(url, ctx.directory, ctx.audio_format, ctx.audio_quality, ctx.ext)
+def fetch_track(pending: Pending, ctx: Ctx) -> Track | Downloaded:
+    """
+    The network stage: download a track's audio, or return its failed Track. One try: download_slots retries it later
+    if it's worth it, rather than this sleeping through a backoff.
+    """
+    if not pending.url:
+        return Track(pending.index, "failed", "", None, None, None, track_error(""))
+    record_state(ctx, pending.index, "downloading", pending.url)
+    emit_event("track_started", index=pending.index, url=pending.url)
+    downloaded, error = download_audio(
+        pending.url,
+        ctx.directory,
+        ctx.audio_format,
+        ctx.audio_quality,
+        ctx.ext,
+        pending.info,
+        progress_reporter(pending.index, pending.url),
+        ctx.breaker,
+        retry_delays_s=(),
+    )
     if downloaded is None:
-        return Track(index, "failed", "", None, url, None, track_error(error))
+        return Track(pending.index, "failed", "", None, pending.url, None, track_error(error))
     info, path = downloaded
+    record_state(ctx, pending.index, "downloaded", pending.url, info.get("id"), info.get("title") or "", path)
+    return Downloaded(pending.url, pending.index, info, path)
+
+
+def finish_track(downloaded: Downloaded, total: int, ctx: Ctx) -> Track:
+    """The local stage: rename a downloaded file to its clean name and tag it."""
+    url, index, info, path = downloaded
     video_id = info.get("id")
     raw_title = info.get("title") or (video_id or "")
-    title = strip(raw_title, ctx.patterns) or raw_title
+    title = ctx.clean_title(raw_title)
     final = finalize(path, ctx.directory, index, title, ctx.ext)
+    record_state(ctx, index, "finalized", url, video_id, title, final)
+    return tag_track(final, title, index, total, video_id, url, ctx, kept_tags(info))
+
+
+def tag_track(
+    final: Path,
+    title: str,
+    index: int,
+    total: int,
+    video_id: str | None,
+    url: str,
+    ctx: Ctx,
+    extra_tags: dict[str, str] | None = None,
+) -> Track:
+    """Tag a finished track. `extra_tags` are its kept_tags, when there is an extraction to take them from."""
     tag_audio(
         final,
         title=title,
@@ -599,7 +1335,9 @@ def download_and_tag(url: str | None, index: int, total: int, ctx: Ctx) -> Track
         album=ctx.album,
         tracknumber=f"{index}/{total}",
         youtube_video_id=video_id,
+        **(extra_tags or {}),
     )
+    record_state(ctx, index, "tagged", url, video_id, title, final)
     report_url = video_url(video_id) if video_id else url
     return Track(index, "downloaded", title, video_id, report_url, str(final))
 
@@ -607,12 +1345,21 @@ def download_and_tag(url: str | None, index: int, total: int, ctx: Ctx) -> Track
 def do_chapters(url: str, top: Info, chapters_file: str, ctx: Ctx) -> tuple[list[Track], str | None]:
     source_id = top.get("id") or ""
     canonical = video_url(source_id) if source_id else url
-    if source_id and source_id in ctx.existing:
+    # An interrupted split leaves some chapters tagged, which would otherwise pass for the whole video being done
+    interrupted = ctx.journal is not None and any(
+        entry.url == canonical and entry.state != "tagged" for entry in ctx.journal.resumable.values()
+    )
+    if source_id and source_id in ctx.existing and not interrupted:
         files = ctx.existing[source_id]
-        return ([Track(i + 1, "skipped", f.stem, source_id, canonical, str(f)) for i, f in enumerate(files)], None)
+        skipped = [Track(i + 1, "skipped", f.stem, source_id, canonical, str(f)) for i, f in enumerate(files)]
+        return [track_done(track) for track in skipped], None
 
     with tempfile.TemporaryDirectory(prefix="ymd-source-") as tmp:
-        downloaded, error = download_audio(url, Path(tmp), ctx.audio_format, ctx.audio_quality, ctx.ext)
+        # `top` is this video's full extraction (see downloader), so download from it rather than extracting again
+        emit_event("track_started", index=None, url=url)  # the source video, not yet any one chapter
+        downloaded, error = download_audio(
+            url, Path(tmp), ctx.audio_format, ctx.audio_quality, ctx.ext, top, progress_reporter(None, url), ctx.breaker
+        )
         if downloaded is None:
             message = extraction_failed_message(f"failed to download source video {url}", error)
             raise UserError("DOWNLOAD_FAILED", message)
@@ -621,52 +1368,113 @@ def do_chapters(url: str, top: Info, chapters_file: str, ctx: Ctx) -> tuple[list
         if chapters_file:
             raw_chapters = parse_chapters_file(chapters_file)
         else:
-            raw_chapters = list(info.get("chapters") or top.get("chapters") or [])
+            # `top`'s chapters first: they're a plan's when there is one, which may not be the video's own
+            raw_chapters = list(top.get("chapters") or info.get("chapters") or [])
 
-        duration = media_duration_s(source_path)
+        duration = resolve_duration_s(source_path, info.get("duration") or top.get("duration"))
         chapters = normalize_chapters(raw_chapters, duration)
         normalized_path = write_normalized_chapters(chapters, source_id)
         log(f"\nnormalized chapters written to {normalized_path} (edit and re-run with --chapters-file to adjust):")
         log(normalized_path.read_text())
 
         total = len(chapters)
-        results: list[Track] = []
-        for i, chapter in enumerate(chapters):
-            index = i + 1
-            raw_title = chapter.title or str(index)
-            title = clean_filename(strip(raw_title, ctx.patterns) or raw_title)
-            dest = ctx.directory / f"{index:02d} - {title}{ctx.ext}"
-            try:
-                ffmpeg_extract_segment(source_path, chapter.start, chapter.end, dest)
-                tag_audio(
-                    dest,
-                    title=title,
-                    artist=ctx.artist,
-                    album=ctx.album,
-                    tracknumber=f"{index}/{total}",
-                    youtube_video_id=source_id,
-                )
-                results.append(Track(index, "downloaded", title, source_id, canonical, str(dest)))
-            except Exception as e:  # report per-chapter failure, keep going
-                log(f"failed to split/tag chapter {index} ({title}): {e}")
-                # A local ffmpeg/tagging failure, so the yt-dlp classification doesn't apply: not permanent, because
-                # what usually fixes it is editing the chapter boundaries and re-running.
-                results.append(Track(index, "failed", title, source_id, canonical, None, TrackError(str(e), False)))
+        titles = [chapter_title(chapter, index, ctx) for index, chapter in enumerate(chapters, 1)]
+        cuts = [
+            ChapterCut(index, chapter, title, ctx.directory / f"{index:02d} - {title}{ctx.ext}")
+            for index, (chapter, title) in enumerate(zip(chapters, titles), 1)
+        ]
+        done = [track_done(track) for cut in cuts if (track := resume_chapter(cut, source_id, canonical, ctx))]
+        todo = [cut for cut in cuts if cut.index not in {track.index for track in done}]
+        for cut in todo:
+            record_state(ctx, cut.index, "queued", canonical, source_id, cut.title)
+        # Contiguous runs of chapters, one per `--jobs` worker, each split in a single ffmpeg pass and then tagged
+        size = max(1, math.ceil(len(todo) / ctx.jobs))
+        batches = [todo[i : i + size] for i in range(0, len(todo), size)]
+        with ThreadPoolExecutor(max_workers=max(1, len(batches))) as pool:
+            source_tags = kept_tags(info)
+            split = pool.map(
+                lambda batch: split_and_tag(source_path, batch, total, source_id, canonical, source_tags, ctx), batches
+            )
+            results = sorted(done + [track for batch in split for track in batch], key=lambda track: track.index)
     return results, str(normalized_path)
 
 
-def retag(directory: str, artist: str | None = None, album: str | None = None) -> dict[str, Any]:
+def resume_chapter(cut: ChapterCut, source_id: str, canonical: str, ctx: Ctx) -> Track | None:
+    """The chapter's Track if an interrupted run already cut and tagged it to the same file, else None."""
+    prior = ctx.journal.resumed(cut.index, canonical) if ctx.journal else None
+    if prior is None or prior.state != "tagged" or prior.file != str(cut.dest) or not cut.dest.is_file():
+        return None
+    return Track(cut.index, "downloaded", cut.title, source_id, canonical, str(cut.dest))
+
+
+def split_and_tag(
+    source: Path,
+    cuts: list[ChapterCut],
+    total: int,
+    source_id: str,
+    canonical: str,
+    source_tags: dict[str, str],
+    ctx: Ctx,
+) -> list[Track]:
+    """
+    Split `cuts` out of `source` and tag them, with the source video's kept_tags (`source_tags`) on each. Reports a
+    failure per chapter rather than for the batch.
+    """
+    split_errors = split_chapters(source, [cut.chapter for cut in cuts], [cut.dest for cut in cuts])
+    results: list[Track] = []
+    for (index, chapter, title, dest), split_error in zip(cuts, split_errors):
+        try:
+            if split_error is not None:
+                raise split_error
+            record_state(ctx, index, "finalized", canonical, source_id, title, dest)
+            warn_if_inaccurate(dest, chapter, index)
+            tag_audio(
+                dest,
+                title=title,
+                artist=ctx.artist,
+                album=ctx.album,
+                tracknumber=f"{index}/{total}",
+                youtube_video_id=source_id,
+                **source_tags,
+            )
+            record_state(ctx, index, "tagged", canonical, source_id, title, dest)
+            results.append(track_done(Track(index, "downloaded", title, source_id, canonical, str(dest))))
+        except Exception as e:  # report per-chapter failure, keep going
+            log(f"failed to split/tag chapter {index} ({title}): {e}")
+            # A local ffmpeg/tagging failure, so the yt-dlp classification doesn't apply: not permanent, because
+            # what usually fixes it is editing the chapter boundaries and re-running.
+            results.append(
+                track_done(Track(index, "failed", title, source_id, canonical, None, TrackError(str(e), False)))
+            )
+    return results
+
+
+def chapter_title(chapter: Chapter, index: int, ctx: Ctx) -> str:
+    raw_title = chapter.title or str(index)
+    return clean_filename(ctx.clean_title(raw_title))
+
+
+def retag(
+    directory: str,
+    artist: str | None = None,
+    album: str | None = None,
+    jobs: int = RETAG_JOBS,
+    dry_run: bool = False,
+) -> dict[str, Any]:
     """
     Rewrite the artist/album tags on an album's files and move its folder to match.
 
     `directory` must be an existing album directory (the `<album>` leaf of the tool's `<artist>/<album>` layout)
     containing .opus/.m4a/.mp3 files. Does not re-download or re-tag titles/track numbers. Errors if the destination
-    already exists.
+    already exists. Up to `jobs` files are retagged at once, each opened once to both update and read its provenance. A
+    `dry_run` checks and reports the same, with each file's `changed`, but neither writes nor moves anything.
     """
+    if jobs < 1:
+        raise UserError("INVALID_ARGS", f"invalid jobs {jobs!r}; must be at least 1")
     src = Path(os.path.expanduser(directory)).resolve()
     if not src.is_dir():
         raise UserError("INVALID_ARGS", f"not a directory: {src}")
-    files = sorted(p for p in src.iterdir() if p.suffix.lower() in SUPPORTED_EXTENSIONS)
+    files = audio_files(src)
     if not files:
         raise UserError("INVALID_ARGS", f"no {'/'.join(SUPPORTED_EXTENSIONS)} files in {src}")
     if artist is None and album is None:
@@ -684,29 +1492,189 @@ def retag(directory: str, artist: str | None = None, album: str | None = None) -
             f"destination already exists: {dest}. You likely already have this album there; move or remove it first.",
         )
 
-    if dest != src:
-        dest.parent.mkdir(parents=True, exist_ok=True)
-        src.rename(dest)
-        try:  # tidy up the old artist dir if the move emptied it
-            src.parent.rmdir()
-        except OSError:
-            pass
-        files = sorted(p for p in dest.iterdir() if p.suffix.lower() in SUPPORTED_EXTENSIONS)
-
-    for f in files:
-        update_tags(f, artist=artist, album=album)
+    if dest != src and not dry_run:
+        move_album(src, dest)
+        files = audio_files(dest)
+    updates = retag_files(files, [artist] * len(files), album, jobs, dry_run)
 
     return {
         "version": SCHEMA_VERSION,
         "ok": True,
         "action": "retag",
+        "dry_run": dry_run,
         "artist": new_artist,
         "album": new_album,
         "directory": str(dest),
-        "files": [{"file": str(f), "youtube_video_id": read_provenance(f)} for f in files],
+        "files": retagged_files(dest, files, updates),
+    }
+
+
+def retag_library(
+    library: str,
+    from_artist: str | None = None,
+    artist: str | None = None,
+    jobs: int = RETAG_JOBS,
+    dry_run: bool = False,
+    recover: Literal["resume", "rollback"] | None = None,
+) -> dict[str, Any]:
+    """
+    Rename artist `from_artist` to `artist` across the library under `library`: every album in the `<artist>` folder
+    of the tool's layout has its artist retagged and moves to the new artist's folder. All the moves are planned, and
+    all their destinations checked, before anything is touched; then the plan is journaled (see journal.RetagPlan)
+    along with every file's artist tag as it was, the albums moved, and all their files retagged together, up to `jobs`
+    at once.
+
+    An interrupted run leaves its journal behind, and the library can't be bulk-retagged again until it's dealt with:
+    `recover="resume"` finishes what it started, `"rollback"` puts everything back, each file getting back the artist
+    tag it had. A `dry_run` reports the plan and what would change, but writes and moves nothing.
+    """
+    if jobs < 1:
+        raise UserError("INVALID_ARGS", f"invalid jobs {jobs!r}; must be at least 1")
+    root = Path(os.path.expanduser(library)).resolve()
+    if not root.is_dir():
+        raise UserError("INVALID_ARGS", f"not a directory: {root}")
+    try:
+        pending = load_retag_plan(root)
+    except ValueError as e:
+        raise UserError("INVALID_ARGS", str(e)) from e
+    if recover is not None:
+        if pending is None:
+            raise UserError("INVALID_ARGS", f"no interrupted library retag to {recover} in {root}")
+        plan = pending if recover == "resume" else pending.reversed()
+    elif pending is not None:
+        raise UserError(
+            "INVALID_ARGS",
+            f"an interrupted library retag ({pending.from_artist!r} to {pending.artist!r}) is pending in {root}; "
+            "finish it with --resume, or undo it with --rollback",
+        )
+    elif not from_artist or not artist:
+        raise UserError("INVALID_ARGS", "provide --from-artist and --artist")
+    else:
+        plan = plan_library_retag(root, from_artist, artist)
+
+    moves = [(Path(src), Path(dest)) for src, dest in plan.moves]
+    if collisions := [str(dest) for src, dest in moves if src != dest and src.is_dir() and dest.exists()]:
+        raise UserError(
+            "INVALID_ARGS",
+            f"destination(s) already exist: {', '.join(collisions)}. Nothing was changed; move or remove them first.",
+        )
+
+    if not dry_run and recover is None:
+        plan = plan._replace(artists=album_artists([src for src, _ in moves], jobs))
+        save_retag_plan(root, plan)
+    albums: list[tuple[Path, list[Path]]] = []
+    artists: list[str | list[str]] = []
+    for i, (src, dest) in enumerate(moves):
+        if src != dest and src.is_dir() and not dry_run:
+            move_album(src, dest)
+        current = src if src.is_dir() else dest  # not moved yet in a dry run, or moved already by the interrupted run
+        if not current.is_dir():
+            log(f"album {src} is gone; skipping it")
+            continue
+        files = audio_files(current)
+        albums.append((dest, files))
+        previous = plan.artists[i] if recover == "rollback" else {}
+        artists += [previous.get(f.name, plan.artist) for f in files]
+    updates = iter(retag_files([f for _, files in albums for f in files], artists, None, jobs, dry_run))
+    if not dry_run:
+        clear_retag_plan(root)
+
+    return {
+        "version": SCHEMA_VERSION,
+        "ok": True,
+        "action": "retag_library",
+        "dry_run": dry_run,
+        "recovery": recover,
+        "library": str(root),
+        "from_artist": plan.from_artist,
+        "artist": plan.artist,
+        "albums": [
+            {"directory": str(dest), "files": retagged_files(dest, files, [next(updates) for _ in files])}
+            for dest, files in albums
+        ],
     }
 
 
+def plan_library_retag(root: Path, from_artist: str, artist: str) -> RetagPlan:
+    """Move every album in `from_artist`'s folder under `root` to `artist`'s, keeping its folder name."""
+    artist_dir = root / clean_filename(from_artist)
+    albums = sorted(d for d in artist_dir.iterdir() if d.is_dir() and audio_files(d)) if artist_dir.is_dir() else []
+    if not albums:
+        raise UserError("INVALID_ARGS", f"no albums with {'/'.join(SUPPORTED_EXTENSIONS)} files in {artist_dir}")
+    dest_dir = root / clean_filename(artist)
+    return RetagPlan(from_artist, artist, [(str(album), str(dest_dir / album.name)) for album in albums], [])
+
+
+def album_artists(albums: list[Path], jobs: int) -> list[dict[str, list[str]]]:
+    """Each of `albums`' files' artist tag (see tagging.read_artist), by filename, reading up to `jobs` at once."""
+    files = [audio_files(album) for album in albums]
+    paths = [f for album in files for f in album]
+    with ThreadPoolExecutor(max_workers=max(1, min(jobs, len(paths))), thread_name_prefix="ymd-retag") as pool:
+        tags = iter(pool.map(read_artist, paths))
+        return [{f.name: next(tags) for f in album} for album in files]
+
+
+def audio_files(directory: Path) -> list[Path]:
+    return sorted(p for p in directory.iterdir() if p.suffix.lower() in SUPPORTED_EXTENSIONS)
+
+
+def move_album(src: Path, dest: Path) -> None:
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    src.rename(dest)
+    try:  # tidy up the old artist dir if the move emptied it
+        src.parent.rmdir()
+    except OSError:
+        pass
+
+
+def retag_files(
+    files: list[Path], artists: Sequence[str | list[str] | None], album: str | None, jobs: int, dry_run: bool
+) -> list[TagUpdate]:
+    """
+    update_tags on each of `files` (with the matching one of `artists`), up to `jobs` at once, then their provenance
+    index, in one write per directory.
+    """
+    with ThreadPoolExecutor(max_workers=max(1, min(jobs, len(files))), thread_name_prefix="ymd-retag") as pool:
+        updates = list(
+            pool.map(lambda f, artist: update_tags(f, artist=artist, album=album, dry_run=dry_run), files, artists)
+        )
+    if not dry_run:
+        by_directory: dict[Path, dict[Path, str | None]] = {}
+        for f, update in zip(files, updates):
+            if update.changed:
+                by_directory.setdefault(f.parent, {})[f] = update.youtube_video_id
+        for directory, video_ids in by_directory.items():
+            record_provenances(directory, video_ids)
+    if rewritten := [f.name for f, update in zip(files, updates) if update.in_place is False]:
+        log(f"no room left in the tags of {', '.join(rewritten)}; rewrote the whole file (later edits will fit)")
+    return updates
+
+
+def retagged_files(directory: Path, files: list[Path], updates: list[TagUpdate]) -> list[dict[str, Any]]:
+    """RETAG_FILE_SCHEMA entries, with the files where they are (or in a dry run, would be) once `directory` moves."""
+    return [
+        {
+            "file": str(directory / f.name),
+            "youtube_video_id": update.youtube_video_id,
+            "changed": update.changed,
+            "in_place": update.in_place,
+        }
+        for f, update in zip(files, updates)
+    ]
+
+
+def resolve_duration_s(path: Path, reported: float | None = None) -> float:
+    """
+    The duration of `path`, without spawning ffprobe when we can avoid it: mutagen parses it in-process, and `reported`
+    (yt-dlp's `info["duration"]`) cross-checks it. ffprobe only settles it when mutagen can't read the file or the two
+    disagree (e.g. a truncated download).
+    """
+    length = audio_length_s(path)
+    if length is None or (reported is not None and abs(length - reported) > DURATION_AGREEMENT_S):
+        return media_duration_s(path)
+    return length
+
+
 def media_duration_s(path: Path) -> float:
     out = subprocess.check_output(
         ["ffprobe", "-v", "error", "-show_entries", "format=duration", "-of", "csv=p=0", str(path)]
@@ -714,6 +1682,18 @@ def media_duration_s(path: Path) -> float:
     return float(out.decode().strip())
 
 
+def seek_input(source: Path, start: float, end: float) -> list[str]:
+    """
+    ffmpeg input options reading only `start`..`end` of `source`. `-ss` goes *before* `-i`, so ffmpeg seeks through the
+    container's index straight to the start instead of reading and discarding every packet up to it (which made cutting
+    N chapters cost O(N^2) in reads). With `-c copy` a cut can only land on a packet boundary, and since every audio
+    packet is a keyframe that is within one packet (~20-30ms) of the requested time; see SEEK_TOLERANCE_S.
+    """
+    if end <= start:
+        raise ValueError(f"chapter ends ({end:g}s) before it starts ({start:g}s)")
+    return ["-ss", str(start), "-t", str(end - start), "-i", str(source)]
+
+
 def ffmpeg_extract_segment(source: Path, start: float, end: float, dest: Path) -> None:
     subprocess.run(
         [
@@ -722,12 +1702,9 @@ def ffmpeg_extract_segment(source: Path, start: float, end: float, dest: Path) -
             "-hide_banner",
             "-loglevel",
             "error",
-            "-i",
-            str(source),
-            "-ss",
-            str(start),
-            "-to",
-            str(end),
+            *seek_input(source, start, end),
+            "-map",
+            "0:a",
             "-c",
             "copy",
             str(dest),
@@ -738,6 +1715,62 @@ def ffmpeg_extract_segment(source: Path, start: float, end: float, dest: Path) -
     )
 
 
+def ffmpeg_split(source: Path, segments: list[tuple[float, float, Path]]) -> None:
+    """
+    Cut every `(start, end, dest)` segment of `source` in a single ffmpeg process. Each segment is its own input-side
+    seek into the source (see seek_input) mapped to its own output, so together the inputs read the source about once,
+    however many chapters there are, and none of them reads from the top of the file.
+    """
+    inputs: list[str] = []
+    outputs: list[str] = []
+    for i, (start, end, dest) in enumerate(segments):
+        inputs += seek_input(source, start, end)
+        outputs += ["-map", f"{i}:a", "-c", "copy", str(dest)]
+    subprocess.run(
+        ["ffmpeg", "-y", "-hide_banner", "-loglevel", "error", *inputs, *outputs],
+        check=True,
+        stdout=sys.stderr.fileno(),
+        stderr=sys.stderr.fileno(),
+    )
+
+
+def split_chapters(source: Path, chapters: list[Chapter], dests: list[Path]) -> list[Exception | None]:
+    """
+    Cut each chapter of `source` to its dest, returning the error (or None) for each. Impossible bounds fail up front;
+    the rest go through one `ffmpeg_split` pass. ffmpeg fails that pass as a whole, so when it does, the chapters are
+    cut again one at a time to find out which of them actually failed.
+    """
+    errors: list[Exception | None] = []
+    for chapter in chapters:
+        try:
+            seek_input(source, chapter.start, chapter.end)
+            errors.append(None)
+        except ValueError as e:
+            errors.append(e)
+    todo = [i for i, error in enumerate(errors) if error is None]
+    try:
+        ffmpeg_split(source, [(chapters[i].start, chapters[i].end, dests[i]) for i in todo])
+        return errors
+    except subprocess.CalledProcessError:
+        log("splitting all chapters in one pass failed; splitting them one at a time to find the failing chapter(s)")
+    for i in todo:
+        try:
+            ffmpeg_extract_segment(source, chapters[i].start, chapters[i].end, dests[i])
+        except Exception as e:
+            errors[i] = e
+    return errors
+
+
+def warn_if_inaccurate(dest: Path, chapter: Chapter, index: int) -> None:
+    """
+    Log a stderr note when a cut's length strays from its chapter's by more than SEEK_TOLERANCE_S. Read in-process with
+    mutagen, so checking every chapter doesn't cost a process spawn each.
+    """
+    length = audio_length_s(dest)
+    if length is not None and abs(length - (chapter.end - chapter.start)) > SEEK_TOLERANCE_S:
+        log(f"note: chapter {index} is {length:.2f}s long, but {chapter.start:g}s-{chapter.end:g}s was requested")
+
+
 def parse_timestamp(value: Any) -> float | None:
     """Parse a chapter time to seconds. Accepts numbers, "SS", "MM:SS", "HH:MM:SS"."""
     if value is None or value == "":
@@ -781,6 +1814,8 @@ def write_normalized_chapters(chapters: list[Chapter], source_id: str) -> Path:
 
 
 def parse_chapters_file(path: str) -> list[dict[str, Any]]:
+    import jsonschema
+
     text = Path(path).read_text()
     try:
         data = json.loads(text)
@@ -819,11 +1854,7 @@ def get_strip_meta_patterns(artist: str, album: str = "") -> list[str]:
 
 
 def strip(s: str, patterns: list[str] | None = None) -> str:
-    if not patterns:
-        return s
-    for pattern in patterns:
-        s = re.sub(pattern, "", s, flags=re.IGNORECASE)
-    return re.sub(r"\s{2,}", " ", s).strip()
+    return TitleCleaner(patterns).strip(s)
 
 
 def clean_filename(name: str) -> str:
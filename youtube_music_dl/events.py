@@ -0,0 +1,80 @@
+"""
+Opt-in progress events (`--events`): newline-delimited JSON, one EVENT_SCHEMA object per line, written as things
+happen, so an orchestrator can act on the first tracks of a long playlist without waiting for the final result.
+
+Events go to whichever EventSink is installed with `emitting`; with none installed (the default), `emit_event` is a
+no-op, so the download code can report unconditionally.
+"""
+
+import json
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import Any, TextIO
+
+from .schema import SCHEMA_VERSION
+
+# yt-dlp calls its progress hooks for every chunk; a track_progress event per chunk would swamp the reader.
+PROGRESS_EVENT_INTERVAL_S = 0.5
+
+
+class EventSink:
+    def __init__(self, stream: TextIO) -> None:
+        self.stream = stream
+        self._lock = threading.Lock()  # events come from every download thread; keep each line whole
+
+    def emit(self, event: str, **fields: Any) -> None:
+        line = json.dumps(
+            {"version": SCHEMA_VERSION, "event": event, "ts": round(time.time(), 3), **fields}, ensure_ascii=False
+        )
+        with self._lock:
+            self.stream.write(line + "\n")
+            self.stream.flush()
+
+
+_sink: EventSink | None = None
+
+
+@contextmanager
+def emitting(sink: EventSink | None) -> Iterator[None]:
+    """Send events to `sink` for the duration (None: keep them off)."""
+    global _sink
+    previous, _sink = _sink, sink
+    try:
+        yield
+    finally:
+        _sink = previous
+
+
+def emit_event(event: str, **fields: Any) -> None:
+    if _sink is not None:
+        _sink.emit(event, **fields)
+
+
+def progress_reporter(index: int | None, url: str) -> Callable[[dict[str, Any]], None] | None:
+    """
+    A yt-dlp progress hook reporting one track's download as `track_progress` events, at most one per
+    PROGRESS_EVENT_INTERVAL_S (plus the last one); None when events are off, so no hook runs at all.
+    """
+    if _sink is None:
+        return None
+    last_s = [float("-inf")]
+
+    def report(status: dict[str, Any]) -> None:
+        now_s = time.monotonic()
+        if status.get("status") == "downloading" and now_s - last_s[0] < PROGRESS_EVENT_INTERVAL_S:
+            return
+        last_s[0] = now_s
+        emit_event(
+            "track_progress",
+            index=index,
+            url=url,
+            status=status.get("status"),
+            downloaded_bytes=status.get("downloaded_bytes"),
+            total_bytes=status.get("total_bytes") or status.get("total_bytes_estimate"),
+            speed_bps=status.get("speed"),
+            eta_s=status.get("eta"),
+        )
+
+    return report
@@ -0,0 +1,150 @@
+"""
+Per-album run journal, so an interrupted run (Ctrl-C, a crash, the OOM killer) can pick up where it stopped.
+
+Provenance tags only mark tracks that were completely finished; everything a run did short of that is lost with its
+in-memory results. So each run appends every track's state transitions to `.ymd-journal.jsonl` in the album directory:
+
+    queued -> downloading -> downloaded -> finalized -> tagged
+
+one JSON object per line, flushed as it happens. The next run reads the latest state per track and resumes from it: a
+`downloaded` track is just renamed and tagged, a `finalized` one just tagged, a `tagged` one reported as done without
+probing its URL again, and anything earlier is downloaded again (yt-dlp continues its own `.part` file). A run that
+completes deletes the journal, since its result JSON is then the record of what happened.
+
+A library-wide `retag` (renaming an artist across all their albums) has a journal of its own, `.ymd-retag-journal.json`
+in the library root: its whole plan, written before anything is touched. The filesystem says how far it got (which
+album directories have moved), and retagging a file is idempotent, so the plan is all a later run needs to either
+finish the job or undo it.
+"""
+
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import IO, NamedTuple
+
+JOURNAL_NAME = ".ymd-journal.jsonl"
+STATES = ("queued", "downloading", "downloaded", "finalized", "tagged")
+RETAG_JOURNAL_NAME = ".ymd-retag-journal.json"
+
+# Every RunJournal with its file open, for close_open_journals
+_open_journals: set["RunJournal"] = set()
+_open_journals_lock = threading.Lock()
+
+
+class JournalEntry(NamedTuple):
+    index: int
+    state: str
+    url: str | None
+    youtube_video_id: str | None = None
+    title: str = ""
+    file: str | None = None  # the downloaded `<id>.<ext>` file, then the finished `NN - Title.<ext>` one
+
+
+class RunJournal:
+    def __init__(self, directory: Path, resume: bool = True) -> None:
+        self.path = directory / JOURNAL_NAME
+        # What the interrupted run got to, by track index; empty when there's nothing to resume
+        self.resumable: dict[int, JournalEntry] = load_journal(self.path) if resume else {}
+        self._lock = threading.Lock()
+        self._fh: IO[str] | None = None
+        if not resume:
+            self.path.unlink(missing_ok=True)
+
+    def resumed(self, index: int, url: str | None) -> JournalEntry | None:
+        """Where the interrupted run left track `index`, if it was the same URL then."""
+        entry = self.resumable.get(index)
+        return entry if entry is not None and url is not None and entry.url == url else None
+
+    def record(self, entry: JournalEntry) -> None:
+        line = json.dumps(entry._asdict(), ensure_ascii=False)
+        with self._lock:
+            if self._fh is None:
+                self._fh = open(self.path, "a", encoding="utf-8")
+                with _open_journals_lock:
+                    _open_journals.add(self)
+            self._fh.write(line + "\n")
+            self._fh.flush()  # in the kernel's hands now, so it survives this process being killed
+
+    def close(self, completed: bool) -> None:
+        """Stop journaling. A `completed` run's journal is deleted; otherwise it's kept for the next run to resume."""
+        with self._lock:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+                with _open_journals_lock:
+                    _open_journals.discard(self)
+            if completed:
+                self.path.unlink(missing_ok=True)
+
+
+def close_open_journals() -> None:
+    """Close every journal still open, keeping each for a re-run to resume; for a process about to exit hard."""
+    with _open_journals_lock:
+        journals = list(_open_journals)
+    for journal in journals:
+        journal.close(completed=False)
+
+
+def load_journal(path: Path) -> dict[int, JournalEntry]:
+    """The latest state of each track in the journal at `path`. A line torn by a kill mid-write is skipped."""
+    latest: dict[int, JournalEntry] = {}
+    try:
+        lines = path.read_text(encoding="utf-8").splitlines()
+    except OSError:
+        return latest
+    for line in lines:
+        try:
+            entry = JournalEntry(**json.loads(line))
+        except (ValueError, TypeError):
+            continue
+        if entry.state in STATES and isinstance(entry.index, int):
+            latest[entry.index] = entry
+    return latest
+
+
+class RetagPlan(NamedTuple):
+    from_artist: str
+    artist: str
+    moves: list[tuple[str, str]]  # each album's directory, and where it goes (the same, if the artist's folder is)
+    # For each album of `moves`, its files' artist tags before the run, by filename: what a rollback puts back, since
+    # they needn't all have been just `from_artist` ("X feat. Y", other casing)
+    artists: list[dict[str, list[str]]]
+
+    def reversed(self) -> "RetagPlan":
+        """The plan that undoes this one's moves; the tags to put back are still each file's in `artists`."""
+        return RetagPlan(self.artist, self.from_artist, [(dest, src) for src, dest in self.moves], self.artists)
+
+
+def save_retag_plan(root: Path, plan: RetagPlan) -> None:
+    """Journal `plan` in `root`, atomically: a crash leaves either no plan or all of it."""
+    fd, tmp = tempfile.mkstemp(prefix=RETAG_JOURNAL_NAME, suffix=".tmp", dir=root)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            json.dump(plan._asdict(), fh, ensure_ascii=False, indent=1)
+            fh.flush()
+            os.fsync(fh.fileno())  # it's what undoes the moves after a crash, so it has to be on disk before them
+        os.replace(tmp, root / RETAG_JOURNAL_NAME)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def load_retag_plan(root: Path) -> RetagPlan | None:
+    """The plan of the library-wide retag interrupted in `root`, if there is one."""
+    try:
+        data = json.loads((root / RETAG_JOURNAL_NAME).read_text(encoding="utf-8"))
+        moves = [(src, dest) for src, dest in data["moves"]]
+        artists = [{name: list(values) for name, values in album.items()} for album in data["artists"]]
+        if len(artists) != len(moves):
+            raise ValueError(f"{len(moves)} albums to move but {len(artists)} with artist tags")
+        return RetagPlan(data["from_artist"], data["artist"], moves, artists)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+        raise ValueError(f"unreadable retag journal {root / RETAG_JOURNAL_NAME}: {e}") from e
+
+
+def clear_retag_plan(root: Path) -> None:
+    (root / RETAG_JOURNAL_NAME).unlink(missing_ok=True)
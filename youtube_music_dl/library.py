@@ -0,0 +1,110 @@
+"""
+Library-wide provenance: which album directories under an output root hold which videos.
+
+The tool lays albums out as `<root>/<artist>/<album>/` (or `<root>/<album>/` with no artist), and each album directory
+keeps its own provenance index (see `tagging.existing_files_by_id`). `LibraryIndex` stitches those together so a run
+can find a video that's already on disk in *another* album, and copy it over instead of downloading it again.
+"""
+
+import shutil
+import sys
+from pathlib import Path
+
+from .tagging import SUPPORTED_EXTENSIONS, existing_files_by_id
+
+# Linux's FICLONE ioctl (_IOW(0x94, 9, int)): make `dest` share `src`'s blocks copy-on-write.
+FICLONE = 0x40049409
+
+# How deep albums sit below the root: <root>/<album> or <root>/<artist>/<album>.
+MAX_ALBUM_DEPTH = 2
+
+
+class LibraryIndex:
+    """Every tagged audio file under `root`, by `youtube_video_id`. Build with `LibraryIndex.load`."""
+
+    def __init__(self, root: Path, files_by_id: dict[str, list[Path]]) -> None:
+        self.root = root
+        self._files_by_id = files_by_id
+
+    @classmethod
+    def load(cls, root: Path) -> "LibraryIndex":
+        """
+        Scan the album directories under `root`. Each one's provenance index means only new or changed files are
+        parsed, so re-loading a big, mostly unchanged library costs about a `stat` per file.
+        """
+        files_by_id: dict[str, list[Path]] = {}
+        for directory in album_dirs(root):
+            for video_id, paths in existing_files_by_id(directory).items():
+                files_by_id.setdefault(video_id, []).extend(paths)
+        return cls(root, files_by_id)
+
+    def files(self, video_id: str) -> list[Path]:
+        """Every file carrying `video_id`, across all albums."""
+        return list(self._files_by_id.get(video_id, []))
+
+    def albums_with(self, video_id: str) -> list[Path]:
+        """The album directories holding `video_id`."""
+        return sorted({path.parent for path in self._files_by_id.get(video_id, [])})
+
+    def ids_under(self, directory: Path) -> set[str]:
+        """Every video id with a file somewhere under `directory`, e.g. an artist's directory."""
+        return {
+            video_id
+            for video_id, paths in self._files_by_id.items()
+            if any(path.is_relative_to(directory) for path in paths)
+        }
+
+    def reusable_file(self, video_id: str, ext: str, exclude: Path) -> Path | None:
+        """
+        A file elsewhere than `exclude` holding the whole of `video_id` in format `ext`, or None. An album holding
+        several files for one id split it into chapters, so none of those files is the whole video.
+        """
+        for album in self.albums_with(video_id):
+            if album == exclude:
+                continue
+            paths = [path for path in self._files_by_id[video_id] if path.parent == album]
+            if len(paths) == 1 and paths[0].suffix.lower() == ext and paths[0].is_file():
+                return paths[0]
+        return None
+
+
+def album_dirs(root: Path) -> list[Path]:
+    """Directories up to MAX_ALBUM_DEPTH below `root` that directly contain audio files."""
+    found: list[Path] = []
+    level = [root]
+    for _ in range(MAX_ALBUM_DEPTH):
+        subdirs: list[Path] = []
+        for directory in level:
+            try:
+                children = sorted(directory.iterdir())
+            except OSError:
+                continue
+            subdirs.extend(c for c in children if c.is_dir() and not c.name.startswith("."))
+        found.extend(d for d in subdirs if has_audio(d))
+        level = subdirs
+    return found
+
+
+def has_audio(directory: Path) -> bool:
+    try:
+        return any(p.suffix.lower() in SUPPORTED_EXTENSIONS for p in directory.iterdir())
+    except OSError:
+        return False
+
+
+def clone_file(src: Path, dest: Path) -> None:
+    """
+    Copy `src` to `dest`, as a reflink where the filesystem supports it (instant, and no extra space until either copy
+    changes), else as a regular copy. Never a hardlink: the tags live inside the file, so retagging one album's
+    hardlinked copy would silently retag the other album's too.
+    """
+    if sys.platform == "linux":
+        import fcntl
+
+        try:
+            with open(src, "rb") as s, open(dest, "wb") as d:
+                fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+            return
+        except OSError:
+            pass  # not a reflink-capable filesystem (or crosses filesystems); fall through to a copy
+    shutil.copyfile(src, dest)
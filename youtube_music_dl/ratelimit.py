@@ -0,0 +1,246 @@
+"""
+Pacing for requests to YouTube, shared by every extraction and download in the process (and, optionally, by every
+process on the machine).
+
+YouTube throttles by IP, not by process or thread, so per-call retry delays stop being enough as soon as several
+downloads run at once: each caller backs off on its own schedule while the others keep hammering. Instead every request
+first takes a token from one `RateLimiter` bucket, which refills at `rate` per second up to `burst`. When a throttling
+error comes back the refill rate is halved (and the burst spent), and each success after that wins a little of it back,
+so the whole run slows down together and speeds up again once YouTube relents.
+
+With a state file, the bucket lives in that file under an exclusive `flock`, so processes sharing an IP (e.g. several
+`batch` workers) share one budget too. That needs `fcntl`, so it's POSIX-only; elsewhere the bucket stays per-process.
+
+Pacing can't help once YouTube has stopped answering altogether, though: every remaining track would then burn its
+whole retry schedule and fail anyway. That's what each run's `CircuitBreaker` is for: after a streak of failures it
+holds all of the run's requests for a cool-down, then lets one canary request through to see whether it's over.
+"""
+
+import json
+import os
+import random
+import sys
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+from .cache import env_float, log
+
+RATE_LIMIT_ENV = "YMD_RATE_LIMIT"
+RATE_LIMIT_FILE_ENV = "YMD_RATE_LIMIT_FILE"
+# Requests per second, and how many may go back to back. A serial run makes well under one request a second, so only
+# parallel runs ever wait on these.
+DEFAULT_RATE_PER_S = 2.0
+DEFAULT_BURST = 10.0
+# The floor the rate can be throttled down to, as a fraction of the configured rate; and how much of the configured
+# rate each success wins back.
+MIN_RATE_FRACTION = 1 / 16
+RECOVERY_FRACTION = 1 / 8
+
+# Substrings (matched case-insensitively) of yt-dlp errors that mean YouTube is throttling us, rather than that a video
+# is broken. The opposite of downloader.PERMANENT_ERROR_FRAGMENTS: these are the failures worth slowing down for.
+THROTTLE_ERROR_FRAGMENTS = ("429", "too many requests", "confirm you're not a bot", "rate-limited", "rate limit")
+
+# Consecutive failed requests (permanent failures aside) that open a run's CircuitBreaker. More than one track's worth
+# of attempts (see downloader.RETRY_DELAYS_S), so a single broken video can't pause the run on its own.
+BREAKER_THRESHOLD = 5
+# How long the breaker holds requests each time it opens without a success in between. Once the canary after the last
+# cool-down fails too, the breaker gives up pausing, and the run carries on failing fast as it would without one.
+BREAKER_COOL_DOWNS_S = (30.0, 60.0, 120.0)
+
+# How far a retry delay may stray from its nominal value, either way. Without it, callers that were throttled together
+# would all retry together, and be throttled together again.
+JITTER_FRACTION = 0.5
+
+
+def is_throttling(error: str) -> bool:
+    normalized = error.lower()
+    return any(fragment in normalized for fragment in THROTTLE_ERROR_FRAGMENTS)
+
+
+def jitter(delay_s: float) -> float:
+    """`delay_s`, randomly stretched or shrunk by up to JITTER_FRACTION."""
+    return delay_s * random.uniform(1 - JITTER_FRACTION, 1 + JITTER_FRACTION)
+
+
+class RateLimiter:
+    def __init__(
+        self,
+        rate_per_s: float,
+        burst: float,
+        state_file: Path | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        """
+        A `rate_per_s` of 0 (or less) turns limiting off. With a `state_file`, `clock` must read the same in every
+        process sharing it; the monotonic clock is system-wide on the platforms that have `flock`.
+        """
+        self.rate_per_s = rate_per_s
+        self.burst = max(1.0, burst)
+        self.state_file = state_file if state_file is not None and sys.platform != "win32" else None
+        self.clock = clock
+        self.sleep = sleep
+        self._lock = threading.Lock()
+        self._state = self._fresh_state()
+
+    @classmethod
+    def from_env(cls) -> "RateLimiter":
+        rate_per_s = env_float(RATE_LIMIT_ENV, DEFAULT_RATE_PER_S)  # at import, so never raise (see env_float)
+        state_file = os.environ.get(RATE_LIMIT_FILE_ENV)
+        return cls(rate_per_s, DEFAULT_BURST, Path(state_file).expanduser() if state_file else None)
+
+    def _fresh_state(self) -> dict[str, float]:
+        return {"tokens": self.burst, "at": self.clock(), "rate": self.rate_per_s}
+
+    @contextmanager
+    def _state_locked(self) -> Iterator[dict[str, float]]:
+        """The bucket's state, held exclusively (across processes too, with a state file) until the block ends."""
+        with self._lock:
+            if self.state_file is None:
+                yield self._state
+                return
+            import fcntl
+
+            self.state_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.state_file, "a+", encoding="utf-8") as fh:
+                fcntl.flock(fh, fcntl.LOCK_EX)  # released when the file closes
+                fh.seek(0)
+                state = parse_state(fh.read()) or self._fresh_state()
+                yield state
+                fh.seek(0)
+                fh.truncate()
+                fh.write(json.dumps(state))
+
+    def acquire(self) -> float:
+        """Take a token, first waiting for one if the bucket is empty. Returns how long that took, in seconds."""
+        if self.rate_per_s <= 0:
+            return 0.0
+        waited_s = 0.0
+        while True:
+            with self._state_locked() as state:
+                now = self.clock()
+                state["tokens"] = min(self.burst, state["tokens"] + max(0.0, now - state["at"]) * state["rate"])
+                state["at"] = now
+                if state["tokens"] >= 1:
+                    state["tokens"] -= 1
+                    return waited_s
+                wait_s = (1 - state["tokens"]) / max(state["rate"], self.rate_per_s * MIN_RATE_FRACTION)
+            self.sleep(wait_s)  # outside the lock, so the others can see the bucket meanwhile
+            waited_s += wait_s
+
+    def throttled(self) -> None:
+        """YouTube is throttling: halve the refill rate, and spend any burst left so nobody goes out right away."""
+        if self.rate_per_s <= 0:
+            return
+        with self._state_locked() as state:
+            state["rate"] = max(self.rate_per_s * MIN_RATE_FRACTION, state["rate"] / 2)
+            state["tokens"] = min(state["tokens"], 0.0)
+
+    def succeeded(self) -> None:
+        """A request went through: win back a step of the configured rate, if throttling took it away."""
+        if self.rate_per_s <= 0:
+            return
+        with self._state_locked() as state:
+            state["rate"] = min(self.rate_per_s, state["rate"] + self.rate_per_s * RECOVERY_FRACTION)
+
+    def current_rate_per_s(self) -> float:
+        with self._state_locked() as state:
+            return state["rate"]
+
+
+def parse_state(text: str) -> dict[str, float] | None:
+    try:
+        state: Any = json.loads(text)
+    except ValueError:
+        return None
+    if not isinstance(state, dict) or not all(isinstance(state.get(k), (int, float)) for k in ("tokens", "at", "rate")):
+        return None
+    return {k: float(state[k]) for k in ("tokens", "at", "rate")}
+
+
+class CircuitBreaker:
+    """
+    Stops a run from hammering YouTube while it's throttled: closed (requests go out) until BREAKER_THRESHOLD requests
+    in a row fail, then open for a cool-down (requests wait), then half-open: the first request out is the canary, and
+    the rest wait on its outcome. A successful canary closes the breaker; a failed one opens it for the next cool-down.
+    Thread-safe, since a run's downloads may run in parallel.
+    """
+
+    def __init__(
+        self, threshold: int = BREAKER_THRESHOLD, cool_downs_s: tuple[float, ...] = BREAKER_COOL_DOWNS_S
+    ) -> None:
+        self.threshold = threshold
+        self.cool_downs_s = cool_downs_s
+        self.paused_s = 0.0  # how long requests were held, in total; the result's `throttle_pause_s`
+        self._cond = threading.Condition()
+        self._failures = 0
+        self._opened_at: float | None = None  # when the current pause began; None while closed
+        self._reopened_at = 0.0  # when the current cool-down began
+        self._trips = 0  # cool-downs in the current pause
+        self._canary_out = False
+        self._gave_up = False
+
+    def wait(self) -> bool:
+        """Hold the caller while the breaker is open. Returns whether the caller's request is the canary."""
+        with self._cond:
+            while self._opened_at is not None:
+                remaining_s = self._reopened_at + self.cool_downs_s[self._trips - 1] - time.monotonic()
+                if remaining_s > 0:
+                    self._cond.wait(remaining_s)
+                elif not self._canary_out:
+                    self._canary_out = True
+                    log("throttle cool-down over, sending one canary request")
+                    return True
+                else:
+                    self._cond.wait()
+            return False
+
+    def record(self, ok: bool, permanent: bool, canary: bool) -> None:
+        """Count a request's outcome (`permanent`: it failed for a reason that says nothing about throttling)."""
+        with self._cond:
+            if self._opened_at is not None and not canary:
+                return  # went out before the breaker opened; the canary decides what happens next
+            if ok:
+                self._failures = 0
+                if canary:
+                    self._close()
+                    log(f"canary request went through, resuming after pausing {self.paused_s:.1f}s in total")
+            elif permanent:
+                if canary:
+                    self._canary_out = False  # a dead video proves nothing either way; let another request try
+                    self._cond.notify_all()
+            elif canary:
+                self._trip()
+            elif not self._gave_up:
+                self._failures += 1
+                if self._failures >= self.threshold:
+                    self._opened_at = time.monotonic()
+                    self._trip()
+
+    def _trip(self) -> None:
+        if self._trips == len(self.cool_downs_s):
+            self._close()
+            self._gave_up = True
+            log(f"still throttled after {len(self.cool_downs_s)} cool-downs; no longer pausing for it")
+            return
+        self._trips += 1
+        self._reopened_at = time.monotonic()
+        self._canary_out = False
+        log(
+            f"{self._failures} requests failed in a row, YouTube is probably throttling; pausing all requests for "
+            f"{self.cool_downs_s[self._trips - 1]:g}s"
+            if self._trips == 1
+            else f"canary request failed too; pausing all requests for {self.cool_downs_s[self._trips - 1]:g}s"
+        )
+
+    def _close(self) -> None:
+        if self._opened_at is not None:
+            self.paused_s += time.monotonic() - self._opened_at
+        self._opened_at = None
+        self._failures = self._trips = 0
+        self._canary_out = False
+        self._cond.notify_all()
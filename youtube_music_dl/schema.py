@@ -5,14 +5,25 @@ The CLI writes exactly one JSON object to stdout (all human/progress logging goe
 to stderr). On success that object conforms to `RESULT_SCHEMA`; on a fatal
 precondition/usage error it conforms to `ERROR_SCHEMA`. Tests validate the CLI's
 real output against these schemas so the two can never drift.
+
+The CLI checks its own output too, before writing it (`check_output`). That's
+cheap next to a download, but not next to a `batch` of thousands of tracks, so
+`YMD_VALIDATE` can turn it down: `full` (the default) checks everything, `sample`
+a random VALIDATE_SAMPLE_RATE of outputs, `off` nothing. Input (plans, manifests,
+chapters files) is always validated, since that's how bad input gets reported.
 """
 
+import functools
+import os
+import random
 from typing import Any, Literal, get_args
 
-import jsonschema
-
 SCHEMA_VERSION = "1"
 
+VALIDATE_ENV = "YMD_VALIDATE"
+VALIDATE_MODES = ("off", "sample", "full")
+VALIDATE_SAMPLE_RATE = 0.05
+
 # Machine-readable error codes an agent can branch on. Keep these stable.
 ErrorCode = Literal[
     "INVALID_ARGS",  # bad/missing CLI arguments
@@ -24,6 +35,7 @@ ErrorCode = Literal[
     "DOWNLOAD_FAILED",  # the (single) source download failed
     "UPGRADE_FAILED",  # `upgrade` subcommand could not upgrade yt-dlp
     "INTERRUPTED",  # KeyboardInterrupt
+    "INTERNAL_ERROR",  # an unexpected exception (a bug); only `batch` reports these, so one album can't stop the rest
 ]
 ERROR_CODES: tuple[ErrorCode, ...] = get_args(ErrorCode)
 
@@ -65,11 +77,29 @@ TRACK_SCHEMA: dict[str, Any] = {
     "else": {"properties": {"error": {"type": "null"}}},
 }
 
+# Only in `batch` output, where results arrive in the order albums finish rather than the manifest's
+MANIFEST_LINE_SCHEMA: dict[str, Any] = {
+    "type": "integer",
+    "minimum": 1,
+    "description": "the (1-based) line of the batch manifest this object answers",
+}
+
 RESULT_SCHEMA: dict[str, Any] = {
     "title": "youtube-music-dl result",
     "type": "object",
     "additionalProperties": False,
-    "required": ["version", "ok", "mode", "album", "artist", "directory", "format", "chapters_file", "tracks"],
+    "required": [
+        "version",
+        "ok",
+        "mode",
+        "album",
+        "artist",
+        "directory",
+        "format",
+        "chapters_file",
+        "tracks",
+        "throttle_pause_s",
+    ],
     "properties": {
         "version": {"const": SCHEMA_VERSION},
         "ok": {"type": "boolean", "description": "true iff no track failed"},
@@ -83,6 +113,12 @@ RESULT_SCHEMA: dict[str, Any] = {
             "description": "absolute path to the normalized chapters file used for a split, else null",
         },
         "tracks": {"type": "array", "items": TRACK_SCHEMA},
+        "throttle_pause_s": {
+            "type": "number",
+            "minimum": 0,
+            "description": "seconds the run held all its requests because YouTube was throttling them (0 if never)",
+        },
+        "manifest_line": MANIFEST_LINE_SCHEMA,
     },
 }
 
@@ -103,10 +139,62 @@ ERROR_SCHEMA: dict[str, Any] = {
                 "message": {"type": "string"},
             },
         },
+        "manifest_line": MANIFEST_LINE_SCHEMA,
     },
 }
 
 
+# --- progress events (--events) ----------------------------------------------
+# With `--events`, the CLI also writes newline-delimited JSON events as things happen: each line is one of these. With
+# the events on stdout, the last line is the usual result or error object (unchanged, just on one line), not an event.
+
+EVENT_BASE_PROPERTIES: dict[str, Any] = {
+    "version": {"const": SCHEMA_VERSION},
+    "ts": {"type": "number", "description": "when it happened, in seconds since the epoch"},
+}
+EVENT_TRACK_PROPERTIES: dict[str, Any] = {
+    "index": {"type": ["integer", "null"], "minimum": 1, "description": "null for a chapters run's source video"},
+    "url": {"type": "string"},
+}
+
+
+def event_schema(event: str, properties: dict[str, Any], base: dict[str, Any] | None = None) -> dict[str, Any]:
+    """One event's schema: `properties` plus the fields every event has (all required), over an optional `base`."""
+    base = base or {}
+    props = {**base.get("properties", {}), **EVENT_BASE_PROPERTIES, "event": {"const": event}, **properties}
+    required = [*base.get("required", []), *EVENT_BASE_PROPERTIES, "event", *properties]
+    return {**base, "type": "object", "additionalProperties": False, "required": required, "properties": props}
+
+
+EVENT_SCHEMA: dict[str, Any] = {
+    "title": "youtube-music-dl event",
+    "oneOf": [
+        event_schema("track_started", EVENT_TRACK_PROPERTIES),
+        event_schema(
+            "track_progress",
+            {
+                **EVENT_TRACK_PROPERTIES,
+                "status": {"enum": ["downloading", "finished", "error"]},
+                "downloaded_bytes": {"type": ["integer", "null"]},
+                "total_bytes": {"type": ["number", "null"], "description": "an estimate when the size isn't known"},
+                "speed_bps": {"type": ["number", "null"], "description": "bytes per second"},
+                "eta_s": {"type": ["number", "null"]},
+            },
+        ),
+        # exactly a TRACK_SCHEMA object, as it will appear in the result's `tracks`, plus the event fields
+        event_schema("track_done", {}, base=TRACK_SCHEMA),
+        event_schema(
+            "retrying",
+            {
+                "what": {"type": "string", "description": "what failed, e.g. 'downloading <url>'"},
+                "delay_s": {"type": "number"},
+                "error": {"type": ["string", "null"], "description": "yt-dlp's explanation, or null when it gave none"},
+            },
+        ),
+    ],
+}
+
+
 # --- probe (dry-run) output --------------------------------------------------
 # `--probe` reports what a real run *would* do for a URL, without downloading, so
 # an agent can decide (e.g. build a --chapters-file for an album video whose
@@ -177,6 +265,90 @@ CHAPTERS_FILE_SCHEMA: dict[str, Any] = {
 }
 
 
+# --- plan (probe output, run input) ------------------------------------------
+# `--probe --plan-out FILE` also writes what it resolved (mode, every track's video id and title, the chapters to split
+# by, the format) as a plan, and `--plan-in FILE` later executes it without extracting the URL again: probe on one
+# machine while reviewing, download on another. Only what stays valid is pinned; yt-dlp's stream URLs expire within
+# hours, so each video is still extracted when it's downloaded.
+
+PLAN_ENTRY_SCHEMA: dict[str, Any] = {
+    "type": "object",
+    "additionalProperties": False,
+    "required": ["index", "youtube_video_id", "title", "url"],
+    "properties": {
+        "index": {"type": "integer", "minimum": 1},
+        "youtube_video_id": {"type": ["string", "null"], "description": "null for an entry that couldn't be listed"},
+        "title": {"type": "string"},
+        "url": {"type": ["string", "null"]},
+    },
+}
+
+PLAN_SCHEMA: dict[str, Any] = {
+    "title": "youtube-music-dl plan",
+    "type": "object",
+    "additionalProperties": False,
+    "required": [
+        "version",
+        "kind",
+        "mode",
+        "urls",
+        "title",
+        "format",
+        "format_selection",
+        "duration_s",
+        "chapters",
+        "entries",
+    ],
+    "properties": {
+        "version": {"const": SCHEMA_VERSION},
+        "kind": {"const": "plan"},
+        "mode": {"enum": ["playlist", "single_songs", "chapters"]},
+        "urls": {"type": "array", "items": {"type": "string"}, "minItems": 1},
+        "title": {"type": ["string", "null"], "description": "the playlist/video title, the default album name"},
+        "format": {"enum": ["opus", "m4a", "mp3"]},
+        "format_selection": {"type": "string", "description": "the yt-dlp format selector the downloads will use"},
+        "duration_s": {"type": ["number", "null"], "description": "length of a single video, else null"},
+        "chapters": {
+            "type": "array",
+            "items": PROBE_CHAPTER_SCHEMA,
+            "description": "in chapters mode, what to split by (the --chapters-file's, if one was given); else empty",
+        },
+        "entries": {"type": "array", "items": PLAN_ENTRY_SCHEMA, "description": "one per track, in track order"},
+    },
+}
+
+
+# --- batch manifest (input) --------------------------------------------------
+# `batch MANIFEST` downloads many albums in one process. Each line of the JSONL manifest holds one album's `downloader`
+# arguments; the output is one RESULT_SCHEMA or ERROR_SCHEMA object per line, with its `manifest_line`.
+
+BATCH_ITEM_SCHEMA: dict[str, Any] = {
+    "title": "youtube-music-dl batch manifest line",
+    "type": "object",
+    "additionalProperties": False,
+    "required": ["artist"],  # as on the command line
+    "anyOf": [{"required": ["urls"]}, {"required": ["plan"]}],
+    "properties": {
+        "urls": {"type": "array", "items": {"type": "string"}, "minItems": 1},
+        "artist": {"type": "string"},
+        "album": {"type": "string"},
+        "playlist_items": {"type": "string"},
+        "strip_patterns": {"type": ["array", "null"], "items": {"type": "string"}},
+        "strip_meta": {"type": "boolean"},
+        "audio_format": {"enum": ["opus", "m4a", "mp3"]},
+        "audio_quality": {"type": "string"},
+        "chapters_file": {"type": "string"},
+        "output_dir": {"type": "string"},
+        "track_numbers": {"type": "string"},
+        "force": {"type": "boolean"},
+        "jobs": {"type": "integer", "minimum": 1},
+        "reuse_library": {"type": "boolean"},
+        "cache": {"type": "boolean"},
+        "plan": PLAN_SCHEMA,
+    },
+}
+
+
 # --- retag output ------------------------------------------------------------
 # `retag <dir>` rewrites the artist/album tags on an album's files and moves the
 # folder to match, without re-downloading.
@@ -184,10 +356,19 @@ CHAPTERS_FILE_SCHEMA: dict[str, Any] = {
 RETAG_FILE_SCHEMA: dict[str, Any] = {
     "type": "object",
     "additionalProperties": False,
-    "required": ["file", "youtube_video_id"],
+    "required": ["file", "youtube_video_id", "changed", "in_place"],
     "properties": {
         "file": {"type": "string"},
         "youtube_video_id": {"type": ["string", "null"]},
+        "changed": {
+            "type": "boolean",
+            "description": "whether the file's artist/album differed, so it was (or in a dry run, would be) retagged",
+        },
+        "in_place": {
+            "type": ["boolean", "null"],
+            "description": "whether the new tags fit in the file's padding; false: the whole file was rewritten. "
+            "null in a dry run",
+        },
     },
 }
 
@@ -195,11 +376,12 @@ RETAG_SCHEMA: dict[str, Any] = {
     "title": "youtube-music-dl retag result",
     "type": "object",
     "additionalProperties": False,
-    "required": ["version", "ok", "action", "artist", "album", "directory", "files"],
+    "required": ["version", "ok", "action", "dry_run", "artist", "album", "directory", "files"],
     "properties": {
         "version": {"const": SCHEMA_VERSION},
         "ok": {"const": True},
         "action": {"const": "retag"},
+        "dry_run": {"type": "boolean", "description": "true: nothing was written or moved; this is what would be"},
         "artist": {"type": "string"},
         "album": {"type": "string"},
         "directory": {"type": "string", "description": "absolute path to the (possibly moved) album directory"},
@@ -208,6 +390,43 @@ RETAG_SCHEMA: dict[str, Any] = {
 }
 
 
+# `retag --library <root> --from-artist X --artist Y` does the same to every album of an artist at once (or, with
+# --resume/--rollback, finishes or undoes an interrupted run of it). `from_artist`/`artist` are the direction that was
+# applied, so a rollback reports them swapped.
+
+RETAG_LIBRARY_SCHEMA: dict[str, Any] = {
+    "title": "youtube-music-dl library retag result",
+    "type": "object",
+    "additionalProperties": False,
+    "required": ["version", "ok", "action", "dry_run", "recovery", "library", "from_artist", "artist", "albums"],
+    "properties": {
+        "version": {"const": SCHEMA_VERSION},
+        "ok": {"const": True},
+        "action": {"const": "retag_library"},
+        "dry_run": {"type": "boolean", "description": "true: nothing was written or moved; this is what would be"},
+        "recovery": {
+            "enum": ["resume", "rollback", None],
+            "description": "how an interrupted run was dealt with, or null for a new one",
+        },
+        "library": {"type": "string", "description": "absolute path to the library root"},
+        "from_artist": {"type": "string"},
+        "artist": {"type": "string"},
+        "albums": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "additionalProperties": False,
+                "required": ["directory", "files"],
+                "properties": {
+                    "directory": {"type": "string", "description": "absolute path to the (moved) album directory"},
+                    "files": {"type": "array", "items": RETAG_FILE_SCHEMA},
+                },
+            },
+        },
+    },
+}
+
+
 # --- upgrade output ----------------------------------------------------------
 # `upgrade` upgrades yt-dlp in the current environment (YouTube changes often, so
 # yt-dlp needs frequent updates). `from`/`to` are the yt-dlp versions before/after.
@@ -228,28 +447,88 @@ UPGRADE_SCHEMA: dict[str, Any] = {
 }
 
 
+# Each of this module's schemas' compiled validator, by the constant's name. Only those: a caller's own schema can be a
+# temporary, whose id() another object may have next time, so it's compiled per call.
+_validators: dict[str, Any] = {}
+
+
+@functools.cache
+def schema_names() -> dict[int, str]:
+    """This module's schema constants' names, by id(): they live as long as the module, so no other object has one."""
+    return {
+        id(value): name for name, value in globals().items() if name.endswith("_SCHEMA") and isinstance(value, dict)
+    }
+
+
+def validate(obj: Any, schema: dict[str, Any]) -> None:
+    """
+    `jsonschema.validate`, minus its per-call cost: each of this module's schemas is checked and compiled into a
+    validator once, and that validator reused. jsonschema itself is imported on first use: it takes about as long to
+    import as everything else the CLI needs put together, and `--print-schema`, `--version` and `--print-skill` never
+    validate anything.
+    """
+    from jsonschema.exceptions import best_match
+    from jsonschema.validators import validator_for
+
+    name = schema_names().get(id(schema))
+    validator = _validators.get(name) if name is not None else None
+    if validator is None:
+        cls = validator_for(schema)
+        cls.check_schema(schema)
+        validator = cls(schema)
+        if name is not None:
+            _validators[name] = validator
+    error = best_match(validator.iter_errors(obj))  # the error `jsonschema.validate` raises
+    if error is not None:
+        raise error
+
+
+def check_output(obj: Any, schema: dict[str, Any]) -> None:
+    """Validate an output the CLI is about to write against its `schema`, as far as `YMD_VALIDATE` asks to."""
+    mode = os.environ.get(VALIDATE_ENV, "full")
+    if mode == "off" or (mode == "sample" and random.random() >= VALIDATE_SAMPLE_RATE):
+        return
+    validate(obj, schema)  # anything but off/sample (e.g. a typo) validates fully, the safe default
+
+
 def validate_result(obj: dict[str, Any]) -> None:
-    jsonschema.validate(obj, RESULT_SCHEMA)
+    validate(obj, RESULT_SCHEMA)
 
 
 def validate_upgrade(obj: dict[str, Any]) -> None:
-    jsonschema.validate(obj, UPGRADE_SCHEMA)
+    validate(obj, UPGRADE_SCHEMA)
 
 
 def validate_chapters_file(obj: Any) -> None:
-    jsonschema.validate(obj, CHAPTERS_FILE_SCHEMA)
+    validate(obj, CHAPTERS_FILE_SCHEMA)
 
 
 def validate_retag(obj: dict[str, Any]) -> None:
-    jsonschema.validate(obj, RETAG_SCHEMA)
+    validate(obj, RETAG_SCHEMA)
+
+
+def validate_retag_library(obj: dict[str, Any]) -> None:
+    validate(obj, RETAG_LIBRARY_SCHEMA)
 
 
 def validate_probe(obj: dict[str, Any]) -> None:
-    jsonschema.validate(obj, PROBE_SCHEMA)
+    validate(obj, PROBE_SCHEMA)
+
+
+def validate_plan(obj: dict[str, Any]) -> None:
+    validate(obj, PLAN_SCHEMA)
+
+
+def validate_batch_item(obj: Any) -> None:
+    validate(obj, BATCH_ITEM_SCHEMA)
+
+
+def validate_event(obj: dict[str, Any]) -> None:
+    validate(obj, EVENT_SCHEMA)
 
 
 def validate_error(obj: dict[str, Any]) -> None:
-    jsonschema.validate(obj, ERROR_SCHEMA)
+    validate(obj, ERROR_SCHEMA)
 
 
 def make_error(code: ErrorCode, message: str) -> dict[str, Any]:
@@ -10,29 +10,84 @@ We support exactly three output formats:
 All three expose mutagen's uniform "easy" mapping interface, so we tag them identically. Each carries the same
 logical fields, including a custom `youtube_video_id` provenance tag. That tag travels with the file (surviving
 moves/renames), and is what we read back to decide whether a video has already been downloaded.
+
+Reading that tag back means parsing every file, so each album directory also keeps a small provenance index
+(`INDEX_NAME`) caching each file's id under its size and mtime. The tag stays the source of truth: a file whose stat no
+longer matches its row is simply parsed again.
+
+Growing a tag block past the padding it has means moving everything after it (for mp3 and opus, all of the audio). So
+the first time we tag a file we leave TAG_PADDING_BYTES of room (ID3 padding, slack after the Ogg comments, an MP4
+`free` atom), and later edits keep that room as it is and are written in place: on a network share, `retag` then sends
+a few KB per file rather than the whole album.
 """
 
+import functools
+import json
+import os
+import tempfile
+import threading
 from pathlib import Path
-from typing import Any
+from typing import Any, NamedTuple
 
-from mutagen.easyid3 import EasyID3
-from mutagen.easymp4 import EasyMP4, EasyMP4Tags
-from mutagen.id3 import ID3NoHeaderError
-from mutagen.oggopus import OggOpus
-
-# Custom provenance field
-# - mp3 needs a one-time TXXX registration
-# - m4a needs a freeform atom registration (stored as `----:com.apple.iTunes:youtube_video_id`)
-# - opus (Vorbis comments) takes arbitrary keys as-is.
 PROVENANCE_KEY = "youtube_video_id"
-EasyID3.RegisterTXXXKey(PROVENANCE_KEY, PROVENANCE_KEY)
-EasyMP4Tags.RegisterFreeformKey(PROVENANCE_KEY, PROVENANCE_KEY)
+
+# Spare room to leave in a file's tag block when we first tag it. Next to any track's audio it's nothing, and it's far
+# more than an artist/album change needs.
+TAG_PADDING_BYTES = 64 * 1024
 
 SUPPORTED_EXTENSIONS = (".opus", ".m4a", ".mp3")
 
+# Per-album provenance index: {"version": 1, "files": {filename: {"size", "mtime_ns", "youtube_video_id"}}}
+INDEX_NAME = ".ymd-index.json"
+INDEX_VERSION = 1
+_index_lock = threading.Lock()
+
+
+class TagUpdate(NamedTuple):
+    youtube_video_id: str | None
+    changed: bool  # whether the artist/album differed, so the file was (or in a dry run, would be) saved
+    # Whether that save was in place (see save_tags), trivially so with nothing to save; None in a dry run
+    in_place: bool | None
+
+
+@functools.cache
+def load_mutagen() -> None:
+    """
+    Import mutagen's taggers, on first use rather than with this module (commands that never touch a file shouldn't
+    pay for them), and register the custom provenance field with them:
+    - mp3 needs a one-time TXXX registration
+    - m4a needs a freeform atom registration (stored as `----:com.apple.iTunes:youtube_video_id`)
+    - opus (Vorbis comments) takes arbitrary keys as-is.
+    mp3 also needs `comment` mapped to an ID3 COMM frame, which EasyID3 lacks; the other two have it built in.
+    """
+    from mutagen.easyid3 import EasyID3
+    from mutagen.easymp4 import EasyMP4Tags
+    from mutagen.id3 import COMM
+
+    EasyID3.RegisterTXXXKey(PROVENANCE_KEY, PROVENANCE_KEY)
+    EasyMP4Tags.RegisterFreeformKey(PROVENANCE_KEY, PROVENANCE_KEY)
+
+    def get_comment(id3: Any, key: str) -> list[str]:
+        return [text for frame in id3.getall("COMM") for text in frame.text]
+
+    def set_comment(id3: Any, key: str, value: list[str]) -> None:
+        id3.delall("COMM")
+        id3.add(COMM(encoding=3, lang="eng", desc="", text=value))
+
+    def delete_comment(id3: Any, key: str) -> None:
+        id3.delall("COMM")
+
+    EasyID3.RegisterKey("comment", get_comment, set_comment, delete_comment)
+
 
 def open_tags(path: Path) -> Any:
     """Open `path` for tagging, dispatching on extension to a mutagen "easy" mapping."""
+    load_mutagen()
+    from mutagen.easyid3 import EasyID3
+    from mutagen.easymp4 import EasyMP4
+    from mutagen.id3 import ID3NoHeaderError
+    from mutagen.oggopus import OggOpus
+
     ext = path.suffix.lower()
     if ext == ".mp3":
         try:
@@ -54,8 +109,15 @@ def tag_audio(
     album: str,
     tracknumber: str,
     youtube_video_id: str | None,
-) -> None:
-    """Write the canonical tags to `path`, dispatching on its extension."""
+    date: str | None = None,
+    comment: str | None = None,
+) -> bool:
+    """
+    Write the canonical tags to `path`, dispatching on its extension, in a single save. yt-dlp embeds none (see
+    downloader.download_opts), so this is the only write a track's tags get; `date` and `comment` carry what we keep of
+    its metadata, and are left as they are when not given. Reserves the padding later edits need; returns whether the
+    save was in place (see save_tags), which a freshly downloaded file's never is.
+    """
     audio = open_tags(path)
     audio["title"] = title
     audio["artist"] = artist
@@ -63,17 +125,61 @@ def tag_audio(
     audio["tracknumber"] = tracknumber
     if youtube_video_id:
         audio[PROVENANCE_KEY] = youtube_video_id
-    audio.save(str(path))
+    if date:
+        audio["date"] = date
+    if comment:
+        audio["comment"] = comment
+    in_place = save_tags(audio, path, TAG_PADDING_BYTES // 2)
+    record_provenance(path, youtube_video_id)
+    return in_place
 
 
-def update_tags(path: Path, *, artist: str | None = None, album: str | None = None) -> None:
-    """Change only the artist and/or album, leaving title, track number, and provenance intact."""
+def update_tags(
+    path: Path, *, artist: str | list[str] | None = None, album: str | None = None, dry_run: bool = False
+) -> TagUpdate:
+    """
+    Change only the artist and/or album, leaving title, track number, and provenance intact, and read the provenance
+    while the file is open anyway. `artist` may also be all of a tag's values, as read_artist returns them (an empty
+    list removing the tag). A file whose tags already say so isn't saved at all, nor is any in a `dry_run`.
+    Unlike tag_audio, doesn't record the provenance in the index: that's left to the caller, so that retagging a whole
+    album writes the index once (see record_provenances).
+    """
     audio = open_tags(path)
-    if artist is not None:
-        audio["artist"] = artist
-    if album is not None:
-        audio["album"] = album
-    audio.save(str(path))
+    value = audio.get(PROVENANCE_KEY)
+    video_id = value[0] if value else None
+    wanted = {
+        key: new if isinstance(new, list) else [new]
+        for key, new in (("artist", artist), ("album", album))
+        if new is not None
+    }
+    changed = any(audio.get(key, []) != new for key, new in wanted.items())
+    if dry_run:
+        return TagUpdate(video_id, changed, None)
+    if not changed:
+        return TagUpdate(video_id, False, True)
+    for key, new in wanted.items():
+        if new:
+            audio[key] = new
+        elif key in audio:
+            del audio[key]
+    return TagUpdate(video_id, True, save_tags(audio, path))
+
+
+def save_tags(audio: Any, path: Path, min_padding: int = 0) -> bool:
+    """
+    Save `audio`'s tags to `path`, keeping the padding left after them as it is if that's at least `min_padding` bytes,
+    and otherwise growing it to TAG_PADDING_BYTES. Returns whether the save was in place: only the tag block written,
+    rather than the whole file (mutagen's default would also trim "excess" padding, which is a rewrite too).
+    """
+    in_place = False
+
+    def padding(info: Any) -> int:
+        nonlocal in_place
+        in_place = info.padding >= min_padding
+        return info.padding if in_place else TAG_PADDING_BYTES
+
+    audio.save(str(path), padding=padding)
+    return in_place
 
 
 def read_provenance(path: Path) -> str | None:
@@ -86,19 +192,111 @@ def read_provenance(path: Path) -> str | None:
     return value[0] if value else None
 
 
+def read_artist(path: Path) -> list[str]:
+    """All of the artist tag's values in an audio file, as update_tags takes them back; empty if it has none."""
+    return list(open_tags(path).get("artist", []))
+
+
+def audio_length_s(path: Path) -> float | None:
+    """The audio's length in seconds, parsed in-process from the container's headers; None if mutagen can't tell."""
+    from mutagen import File as MutagenFile
+
+    try:
+        audio = MutagenFile(str(path))
+    except Exception:
+        return None
+    length = getattr(getattr(audio, "info", None), "length", None)
+    return float(length) if length else None
+
+
 def existing_files_by_id(directory: Path) -> dict[str, list[Path]]:
     """Map each already-downloaded youtube_video_id to the file(s) carrying it.
 
     Used for idempotency: a video whose id is already present is skipped. Chapter
     splits produce several files that share the source video's id, hence a list.
+    Only files that are new or changed since the provenance index last saw them are
+    opened; the refreshed index is saved back.
     """
     by_id: dict[str, list[Path]] = {}
     if not directory.is_dir():
         return by_id
-    for path in sorted(directory.iterdir()):
-        if path.suffix.lower() not in SUPPORTED_EXTENSIONS:
-            continue
-        video_id = read_provenance(path)
-        if video_id:
-            by_id.setdefault(video_id, []).append(path)
+    with _index_lock:
+        rows = load_index(directory)
+        fresh: dict[str, dict[str, Any]] = {}
+        for path in sorted(directory.iterdir()):
+            if path.suffix.lower() not in SUPPORTED_EXTENSIONS:
+                continue
+            row = rows.get(path.name)
+            if row is None or not stat_matches(path, row):
+                row = index_row(path, read_provenance(path))
+            fresh[path.name] = row
+            video_id = row["youtube_video_id"]
+            if video_id:
+                by_id.setdefault(video_id, []).append(path)
+        if fresh != rows:
+            save_index(directory, fresh)
     return by_id
+
+
+def index_row(path: Path, video_id: str | None) -> dict[str, Any]:
+    stat = path.stat()
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "youtube_video_id": video_id}
+
+
+def stat_matches(path: Path, row: dict[str, Any]) -> bool:
+    try:
+        stat = path.stat()
+    except OSError:
+        return False
+    return stat.st_size == row.get("size") and stat.st_mtime_ns == row.get("mtime_ns")
+
+
+def load_index(directory: Path) -> dict[str, dict[str, Any]]:
+    """
+    The provenance index rows of `directory`, by filename. A missing or unreadable index is just empty, and a malformed
+    row just missing, so its file is parsed again.
+    """
+    try:
+        data = json.loads((directory / INDEX_NAME).read_text())
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != INDEX_VERSION or not isinstance(data.get("files"), dict):
+        return {}
+    return {name: row for name, row in data["files"].items() if is_index_row(row)}
+
+
+def is_index_row(row: Any) -> bool:
+    """Whether `row` has the shape index_row gives one."""
+    return (
+        isinstance(row, dict)
+        and all(isinstance(row.get(key), int) for key in ("size", "mtime_ns"))
+        and "youtube_video_id" in row
+        and (row["youtube_video_id"] is None or isinstance(row["youtube_video_id"], str))
+    )
+
+
+def save_index(directory: Path, rows: dict[str, dict[str, Any]]) -> None:
+    """Atomically replace the provenance index. It's only a cache, so failing to write it (read-only dir) is fine."""
+    try:
+        fd, tmp = tempfile.mkstemp(prefix=INDEX_NAME, suffix=".tmp", dir=directory)
+    except OSError:
+        return
+    try:
+        with os.fdopen(fd, "w") as fh:
+            json.dump({"version": INDEX_VERSION, "files": rows}, fh, indent=1, sort_keys=True)
+        os.replace(tmp, directory / INDEX_NAME)
+    except OSError:
+        Path(tmp).unlink(missing_ok=True)
+
+
+def record_provenance(path: Path, video_id: str | None) -> None:
+    """Update `path`'s row in its directory's provenance index, right after we've written the file."""
+    record_provenances(path.parent, {path: video_id})
+
+
+def record_provenances(directory: Path, video_ids: dict[Path, str | None]) -> None:
+    """record_provenance for several files of `directory` at once, in one write of its index."""
+    with _index_lock:
+        rows = load_index(directory)
+        rows.update({path.name: index_row(path, video_id) for path, video_id in video_ids.items()})
+        save_index(directory, rows)